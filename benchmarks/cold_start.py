@@ -0,0 +1,124 @@
+"""
+Cold-start benchmark for app.py.
+
+Measures, in fresh interpreter processes:
+- import time of src.main (wall clock, plus the slowest modules from -X importtime)
+- time to first render of app.py through Streamlit's AppTest
+
+Run from the repository root:
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --runs 5 --save bench_cold_start.json
+    python -m benchmarks.cold_start --runs 5 --baseline bench_cold_start.json --max-regression 0.2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import src.main"
+
+FIRST_RENDER_SNIPPET = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("app.py", default_timeout=120)
+app.run()
+elapsed = time.perf_counter() - start
+if app.exception:
+    raise SystemExit(f"app.py raised during first render: {app.exception}")
+print(elapsed)
+"""
+
+
+def _run_python(args):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"benchmark subprocess failed:\n{result.stderr}")
+    return elapsed, result
+
+
+def measure_import(runs):
+    """
+    This function returns the wall-clock import times of src.main in fresh processes.
+    """
+    return [_run_python(["-c", IMPORT_SNIPPET])[0] for _ in range(runs)]
+
+
+def slowest_imports(limit=15):
+    """
+    This function returns the modules with the highest cumulative import time for src.main.
+    """
+    _, result = _run_python(["-X", "importtime", "-c", IMPORT_SNIPPET])
+    rows = []
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 2)} for us, name in rows[:limit]]
+
+
+def measure_first_render(runs):
+    """
+    This function returns the time to first render of app.py in fresh processes.
+    """
+    return [float(_run_python(["-c", FIRST_RENDER_SNIPPET])[1].stdout.strip().splitlines()[-1]) for _ in range(runs)]
+
+
+def summarize(samples):
+    return {
+        "runs": len(samples),
+        "median_s": round(statistics.median(samples), 4),
+        "min_s": round(min(samples), 4),
+        "max_s": round(max(samples), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import and first-render time of app.py.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-render", action="store_true", help="only measure import time")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a JSON file written by --save")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {
+        "import": summarize(measure_import(args.runs)),
+        "slowest_imports": slowest_imports(),
+    }
+    if not args.skip_render:
+        results["first_render"] = summarize(measure_first_render(args.runs))
+
+    print(json.dumps(results, indent=2))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failed = False
+        for metric in ("import", "first_render"):
+            if metric not in results or metric not in baseline:
+                continue
+            limit = baseline[metric]["median_s"] * (1 + args.max_regression)
+            if results[metric]["median_s"] > limit:
+                print(f"REGRESSION: {metric} median {results[metric]['median_s']}s > {limit:.4f}s", file=sys.stderr)
+                failed = True
+        sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Deterministic local stand-ins for the LLM providers and Tavily, so workflows can be benchmarked offline.
+"""
+import json
+import random
+import threading
+import time
+from typing import List, Optional, Type
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.workflow.utils.text import estimate_tokens
+
+WORDS = (
+    "model agent benchmark release research dataset inference latency open source startup funding "
+    "regulation policy chip training reasoning multimodal robotics safety evaluation launch partnership"
+).split()
+
+
+def _text(seed, n_words):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    This class is a chat model that answers locally after a configurable delay.
+    latency is the time to first token; tokens_per_second sets the generation speed.
+    When tools are bound, the model makes tool_calls tool round trips before answering.
+    """
+    latency: float = 0.2
+    tokens_per_second: float = 200.0
+    reply_tokens: int = 60
+    tool_calls: int = 1
+    tool_names: List[str] = Field(default_factory=list)
+    model_name: str = "fake-chat-model"
+
+    @property
+    def _llm_type(self):
+        return "fake-benchmark"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"tool_names": [getattr(tool, "name", str(tool)) for tool in tools]})
+
+    def _tool_call(self, messages):
+        # Count the tool round trips since the last user message
+        rounds = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, ToolMessage):
+                rounds += 1
+        if not self.tool_names or rounds >= self.tool_calls:
+            return None
+        query = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+        return {"name": self.tool_names[0], "args": {"query": str(query)[:100]}, "id": f"call_{rounds}_{random.getrandbits(32):x}"}
+
+    def _usage(self, messages, completion_tokens):
+        prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        return {"input_tokens": prompt_tokens, "output_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+    def _reply(self, messages):
+        return _text(sum(len(str(m.content)) for m in messages), self.reply_tokens)
+
+    def _generate(self, messages, stop=None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs):
+        tool_call = self._tool_call(messages)
+        if tool_call:
+            time.sleep(self.latency)
+            message = AIMessage(content="", tool_calls=[tool_call], usage_metadata=self._usage(messages, 10))
+        else:
+            time.sleep(self.latency + self.reply_tokens / self.tokens_per_second)
+            message = AIMessage(content=self._reply(messages), usage_metadata=self._usage(messages, self.reply_tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs):
+        time.sleep(self.latency)
+        tool_call = self._tool_call(messages)
+        if tool_call:
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[{"name": tool_call["name"], "args": json.dumps(tool_call["args"]), "id": tool_call["id"], "index": 0}],
+                usage_metadata=self._usage(messages, 10),
+            ))
+            return
+
+        for i, word in enumerate(self._reply(messages).split()):
+            time.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=word + " ",
+                usage_metadata=self._usage(messages, self.reply_tokens) if i == 0 else None,
+            ))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class FakeTavilyClient:
+    """
+    This class answers Tavily news searches with canned articles after a configurable delay.
+    With unique=True every call returns new article text, so content-keyed caches always miss.
+    """
+    def __init__(self, latency=0.3, articles=10, words_per_article=300, unique=False):
+        self.latency = latency
+        self.articles = articles
+        self.words_per_article = words_per_article
+        self.unique = unique
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search(self, query, max_results=5, **kwargs):
+        with self._lock:
+            self.calls += 1
+            salt = self.calls if self.unique else 0
+        time.sleep(self.latency)
+        results = []
+        for i in range(min(max_results, self.articles)):
+            seed = f"{query}-{i}-{salt}"
+            results.append({
+                "title": _text(f"title-{seed}", 8),
+                "url": f"https://news.example.com/{abs(hash(seed)) % 10**8}",
+                "content": _text(seed, self.words_per_article),
+                "published_date": "2026-01-01",
+                "score": 1.0 - i / 100,
+            })
+        return {"query": query, "results": results}
+
+
+class FakeSearchInput(BaseModel):
+    query: str = Field(description="search query")
+
+
+class FakeSearchTool(BaseTool):
+    """
+    This class is a web search tool that returns canned results after a configurable delay.
+    """
+    name: str = "tavily_search"
+    description: str = "Search the web for up-to-date information."
+    args_schema: Type[BaseModel] = FakeSearchInput
+    latency: float = 0.3
+    results: int = 2
+
+    def _run(self, query: str, **kwargs):
+        time.sleep(self.latency)
+        return json.dumps({"query": query, "results": [
+            {"title": _text(f"{query}-{i}", 8), "url": f"https://example.com/{i}", "content": _text(f"{query}-{i}", 80)}
+            for i in range(self.results)
+        ]})
@@ -0,0 +1,256 @@
+"""
+Concurrent-session load test for app.py.
+
+Drives many simulated Streamlit sessions through load_layout headlessly with AppTest, in one process
+like a single app worker, against local stub servers for the LLM (OpenAI-compatible) and Tavily APIs.
+Reports rerun latency percentiles, throughput, per-session memory growth and thread-pool saturation.
+Run from the repository root:
+    python -m benchmarks.load_test --sessions 20 --concurrency 10
+    python -m benchmarks.load_test --flow news --sessions 8 --llm-latency 1.0 --json bench_load.json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_servers import start_llm_server, start_tavily_server
+from benchmarks.workflows import percentile
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+FLOWS = {"chat": "Chatbot", "search": "Chatbot with Web Search", "news": "AI News Summarizer"}
+
+
+def _pool_name(thread_name):
+    # "digest-job_3", "ThreadPoolExecutor-2_0" and "Thread-7 (process_request_thread)" count under their pool
+    thread_name = re.sub(r"^Thread-\d+ \((.*)\)$", r"\1", thread_name)
+    return re.sub(r"[-_]\d+(_\d+)?$", "", thread_name)
+
+
+class ThreadSampler:
+    """
+    This class samples the live threads, grouped by pool name, to find saturated thread pools.
+    """
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = Counter()
+        self.peak_total = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            groups = Counter(_pool_name(thread.name) for thread in threading.enumerate())
+            for name, count in groups.items():
+                self.peak[name] = max(self.peak[name], count)
+            self.peak_total = max(self.peak_total, sum(groups.values()))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def allow_concurrent_apptests():
+    """
+    This function lets several AppTest sessions run at once in one process.
+    AppTest installs a mock Streamlit runtime for each run and resets it to None afterwards, which breaks
+    any other session that is still running; a shared fallback runtime covers those gaps.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    fallback = MagicMock(spec=Runtime)
+    fallback.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    fallback.cache_storage_manager = MemoryCacheStorageManager()
+    try:
+        from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+        fallback.dataframe_source_mgr = DataframeSourceManager()
+    except ImportError:
+        pass
+    Runtime.instance = classmethod(lambda cls: cls._instance or fallback)
+    Runtime.exists = classmethod(lambda cls: True)
+
+
+def rss_mb():
+    """
+    This function returns the resident set size of this process in MB, where /proc is available.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class Session:
+    """
+    This class is one simulated browser session, timing every rerun of the app.
+    """
+    def __init__(self, index, flow, args, latencies, errors):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.flow = flow
+        self.args = args
+        self.latencies = latencies
+        self.errors = errors
+        self.app = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+
+    def run(self):
+        self._rerun()
+        self._select("Select LLM Model", "OpenAI")
+        self._select("Select Use Case", FLOWS[self.flow])
+        if self.flow == "news":
+            frequencies = ("Daily", "Weekly", "Monthly")
+            for turn in range(self.args.turns):
+                self._select("Select Time Frame", frequencies[(self.index + turn) % len(frequencies)])
+                self._click("Fetch Latest AI News")
+                # Poll the background digest job like the page's progress fragment does
+                deadline = time.time() + self.args.timeout
+                while "digest_job" in self.app.session_state and time.time() < deadline:
+                    time.sleep(self.args.poll_interval)
+                    self._rerun()
+        else:
+            for turn in range(self.args.turns):
+                self.app.chat_input[0].set_value(f"Session {self.index} question {turn} about AI agents")
+                self._rerun()
+
+    def _select(self, label, value):
+        next(widget for widget in self.app.selectbox if widget.label == label).set_value(value)
+        self._rerun()
+
+    def _click(self, label):
+        next(widget for widget in self.app.button if widget.label == label).click()
+        self._rerun()
+
+    def _rerun(self):
+        start = time.perf_counter()
+        self.app.run()
+        self.latencies[self.flow].append(time.perf_counter() - start)
+        for element in list(self.app.exception) + list(self.app.error):
+            self.errors[self.flow].append(str(getattr(element, "message", None) or getattr(element, "value", element))[:200])
+
+
+def _drive_sessions(args, count, flows, latencies, errors):
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [
+            executor.submit(Session(i, flows[i % len(flows)], args, latencies, errors).run)
+            for i in range(count)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                errors["harness"].append(repr(e)[:200])
+
+
+def run_load_test(args):
+    """
+    This function runs the sessions concurrently and returns the report.
+    """
+    flows = list(FLOWS) if args.flow == "mixed" else [args.flow]
+    latencies = defaultdict(list)
+    errors = defaultdict(list)
+
+    allow_concurrent_apptests()
+    # Latency, throughput and RSS are measured with tracemalloc off: tracing slows the app many times over
+    rss_start = rss_mb()
+    sampler = ThreadSampler().start()
+    start = time.perf_counter()
+    _drive_sessions(args, args.sessions, flows, latencies, errors)
+    wall = time.perf_counter() - start
+    sampler.stop()
+    rss_end = rss_mb()
+
+    # Python heap growth per session comes from a separate, untimed pass of one concurrent wave
+    memory_sessions = args.memory_sessions or args.concurrency
+    tracemalloc.start()
+    _drive_sessions(args, memory_sessions, flows, defaultdict(list), defaultdict(list))
+    traced, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    reruns = sum(len(samples) for samples in latencies.values())
+    return {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_reruns_per_s": round(reruns / wall, 3),
+        "throughput_sessions_per_s": round(args.sessions / wall, 3),
+        "flows": {
+            flow: {
+                "reruns": len(samples),
+                "p50_s": round(percentile(samples, 50), 4),
+                "p95_s": round(percentile(samples, 95), 4),
+                "p99_s": round(percentile(samples, 99), 4),
+                "max_s": round(max(samples), 4),
+                "errors": len(errors[flow]),
+            }
+            for flow, samples in sorted(latencies.items())
+        },
+        "memory": {
+            "python_heap_growth_per_session_mb": round(traced / 1024 / 1024 / memory_sessions, 3),
+            "python_heap_peak_mb": round(peak / 1024 / 1024, 2),
+            "rss_growth_per_session_mb": round((rss_end - rss_start) / args.sessions, 3) if rss_start else None,
+        },
+        "threads": {"peak_total": sampler.peak_total, "peak_by_pool": dict(sampler.peak.most_common(12))},
+        "stubs": {"llm": args.llm_server.stats(), "tavily": args.tavily_server.stats()},
+        "error_samples": {flow: messages[:3] for flow, messages in errors.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test app.py with concurrent simulated sessions and local API stubs.")
+    parser.add_argument("--flow", choices=tuple(FLOWS) + ("mixed",), default="mixed")
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=6, help="sessions driven at the same time")
+    parser.add_argument("--turns", type=int, default=2, help="messages (or fetches) per session")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub LLM time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--reply-tokens", type=int, default=60)
+    parser.add_argument("--search-latency", type=float, default=0.3, help="stub Tavily latency (s)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="seconds between progress reruns")
+    parser.add_argument("--timeout", type=float, default=120.0, help="limit per rerun and per digest job (s)")
+    parser.add_argument("--memory-sessions", type=int, help="sessions of the untimed heap measurement pass (default: --concurrency)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    args.llm_server = start_llm_server(args.llm_latency, args.tokens_per_second, args.reply_tokens)
+    args.tavily_server = start_tavily_server(args.search_latency)
+    # Point the app at the stubs and keep its caches, stores and checkpoints in a scratch directory
+    os.environ.update({
+        "OPENAI_API_KEY": "stub-key",
+        "OPENAI_BASE_URL": f"{args.llm_server.url}/v1",
+        "TAVILY_API_KEY": "stub-key",
+        "TAVILY_API_BASE_URL": args.tavily_server.url,
+        "AI_NEWS_DATA_DIR": tempfile.mkdtemp(prefix="ai_news_load_"),
+    })
+
+    report = run_load_test(args)
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
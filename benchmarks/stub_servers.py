@@ -0,0 +1,179 @@
+"""
+Local HTTP stand-ins for the OpenAI chat completions API and the Tavily search API, with configurable latency.
+
+The app reaches them through OPENAI_BASE_URL and TAVILY_API_BASE_URL, so the full client stack
+(SDKs, connection handling, retries) is exercised without network access or API keys.
+"""
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fakes import _text
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _LLMHandler(_StubHandler):
+    """
+    This class answers OpenAI-compatible chat completion requests, streamed or not.
+    When tools are offered and the last message is from the user, it answers with a call to the first tool.
+    """
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        request = self._read_json()
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency)
+            messages = request.get("messages", [])
+            tools = request.get("tools") or []
+            tool_call = None
+            if tools and messages and messages[-1].get("role") == "user":
+                tool_call = {
+                    "id": f"call_{server.requests}",
+                    "type": "function",
+                    "function": {
+                        "name": tools[0]["function"]["name"],
+                        "arguments": json.dumps({"query": str(messages[-1].get("content", ""))[:100]}),
+                    },
+                }
+            reply = "" if tool_call else _text(len(json.dumps(messages)), server.reply_tokens)
+            prompt_tokens = len(json.dumps(messages)) // 4
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": server.reply_tokens,
+                     "total_tokens": prompt_tokens + server.reply_tokens}
+            if request.get("stream"):
+                self._stream(request, reply, tool_call, usage)
+            else:
+                message = {"role": "assistant", "content": reply}
+                if tool_call:
+                    message["tool_calls"] = [tool_call]
+                self._send_json({
+                    "id": f"chatcmpl-{server.requests}", "object": "chat.completion", "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_call else "stop"}],
+                    "usage": usage,
+                })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _stream(self, request, reply, tool_call, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        def event(delta, finish_reason=None):
+            chunk = {
+                "id": "chatcmpl-stream", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if finish_reason:
+                chunk["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        if tool_call:
+            event({"role": "assistant", "tool_calls": [dict(tool_call, index=0)]})
+            event({}, "tool_calls")
+        else:
+            for word in reply.split():
+                time.sleep(1 / self.server.tokens_per_second)
+                event({"role": "assistant", "content": word + " "})
+            event({}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class _TavilyHandler(_StubHandler):
+    """
+    This class answers Tavily search requests with canned, recently dated articles.
+    """
+    def do_POST(self):
+        if not self.path.endswith("/search"):
+            self.send_error(404)
+            return
+        request = self._read_json()
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency)
+            query = request.get("query", "")
+            now = time.time()
+            results = [
+                {
+                    "title": _text(f"title-{query}-{i}", 8),
+                    "url": f"https://news.example.com/{abs(hash((query, i))) % 10**8}",
+                    "content": _text(f"{query}-{i}", server.words_per_article),
+                    # Spread over the last month, so every time frame has articles
+                    "published_date": formatdate(now - i * 3 * 24 * 60 * 60 / 2, usegmt=True),
+                    "score": 1.0 - i / 100,
+                }
+                for i in range(int(request.get("max_results") or 5))
+            ]
+            self._send_json({"query": query, "results": results, "response_time": server.latency})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    This class runs one stub API on a local port in a daemon thread and counts its traffic.
+    """
+    daemon_threads = True
+
+    def __init__(self, handler, **settings):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        for name, value in settings.items():
+            setattr(self, name, value)
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "peak_in_flight": self.peak_in_flight}
+
+
+def start_llm_server(latency=0.5, tokens_per_second=100.0, reply_tokens=60):
+    return StubServer(_LLMHandler, latency=latency, tokens_per_second=tokens_per_second, reply_tokens=reply_tokens).start()
+
+
+def start_tavily_server(latency=0.3, words_per_article=300):
+    return StubServer(_TavilyHandler, latency=latency, words_per_article=words_per_article).start()
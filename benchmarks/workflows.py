@@ -0,0 +1,180 @@
+"""
+Offline benchmark for the three workflows, using the local stand-ins in benchmarks/fakes.py.
+
+Reports per-node latency, end-to-end p50/p99, throughput under concurrency and peak memory.
+Needs no network access. Run from the repository root:
+    python -m benchmarks.workflows
+    python -m benchmarks.workflows --workflow ai_news --runs 20 --concurrency 8 --articles 20
+    python -m benchmarks.workflows --cold --json bench_workflows.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Keep caches and stores of the benchmark away from the app's data directory
+os.environ.setdefault("AI_NEWS_DATA_DIR", tempfile.mkdtemp(prefix="ai_news_bench_"))
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fakes import FakeChatModel, FakeSearchTool, FakeTavilyClient
+
+WORKFLOWS = ("chatbot", "chatbot_tools", "ai_news")
+
+
+class NodeTimer(BaseCallbackHandler):
+    """
+    This class records the wall time of every graph node run.
+    """
+    def __init__(self):
+        self.durations = defaultdict(list)
+        self._starts = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Only the node's own run, not the runnables nested inside it
+        if node and kwargs.get("name") == node:
+            with self._lock:
+                self._starts[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+            if started:
+                self.durations[started[0]].append(time.perf_counter() - started[1])
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._starts.pop(run_id, None)
+
+
+def build_workflow(name, args):
+    """
+    This function compiles a workflow against the fake model and search stand-ins.
+    """
+    model = FakeChatModel(
+        latency=args.latency, tokens_per_second=args.tokens_per_second,
+        reply_tokens=args.reply_tokens, tool_calls=args.tool_calls,
+    )
+    if name == "chatbot":
+        from src.workflow.graphs.chatbot_graph import Chatbot_graph
+        return Chatbot_graph(model=model).build_graph(), "What is retrieval augmented generation?"
+    if name == "chatbot_tools":
+        from src.workflow.graphs.chatbot_with_tools_graph import Chatbot_with_tools_graph
+        tools = [FakeSearchTool(latency=args.search_latency)]
+        return Chatbot_with_tools_graph(model=model, tools=tools).build_graph(), "What happened in AI today?"
+    if name == "ai_news":
+        from src.workflow.graphs.ai_news_summarizer_graph import AINewsSummarizerGraph
+        tavily = FakeTavilyClient(
+            latency=args.search_latency, articles=args.articles,
+            words_per_article=args.words_per_article, unique=args.cold,
+        )
+        graph = AINewsSummarizerGraph(model=model, summary_mode=args.summary_mode, tavily_client=tavily)
+        return graph.build_graph(), "daily"
+    raise ValueError(f"Unknown workflow {name}")
+
+
+def clear_caches():
+    from src.workflow.cache.ttl_cache import get_ttl_cache
+    from src.workflow.cache.lru_cache import get_lru_cache
+    get_ttl_cache("tavily_news").clear()
+    get_lru_cache("news_summaries").clear()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def run_workflow(name, args):
+    """
+    This function benchmarks one workflow and returns its report.
+    """
+    graph, prompt = build_workflow(name, args)
+    timer = NodeTimer()
+    latencies = []
+
+    def run_once(_):
+        if args.cold:
+            clear_caches()
+        start = time.perf_counter()
+        graph.invoke({"messages": [HumanMessage(content=prompt)]}, config={"callbacks": [timer]})
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        return elapsed
+
+    # Warm up imports and lazily created clients outside the measurement
+    run_once(None)
+    latencies.clear()
+    timer.durations.clear()
+
+    # Latency and throughput are measured with tracemalloc off: tracing slows allocation-heavy nodes many times over
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(run_once, range(args.runs)))
+    wall = time.perf_counter() - start
+    timed_latencies = list(latencies)
+    durations = {node: list(samples) for node, samples in timer.durations.items()}
+
+    # Peak memory comes from a separate, untimed pass of one concurrent wave
+    tracemalloc.start()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(run_once, range(args.memory_runs or args.concurrency)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "workflow": name,
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "p50_s": round(percentile(timed_latencies, 50), 4),
+        "p99_s": round(percentile(timed_latencies, 99), 4),
+        "mean_s": round(statistics.mean(timed_latencies), 4),
+        "throughput_rps": round(args.runs / wall, 3),
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+        "nodes": {
+            node: {"calls": len(samples), "p50_s": round(percentile(samples, 50), 4), "p99_s": round(percentile(samples, 99), 4)}
+            for node, samples in sorted(durations.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the workflows offline with fake LLM and Tavily stand-ins.")
+    parser.add_argument("--workflow", choices=WORKFLOWS + ("all",), default="all")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--reply-tokens", type=int, default=60)
+    parser.add_argument("--tool-calls", type=int, default=1, help="tool round trips per message")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="fake Tavily latency (s)")
+    parser.add_argument("--articles", type=int, default=10, help="articles per fake news search")
+    parser.add_argument("--words-per-article", type=int, default=300)
+    parser.add_argument("--summary-mode", choices=("map_reduce", "stuff"), default="stuff")
+    parser.add_argument("--cold", action="store_true", help="clear caches and vary articles on every run")
+    parser.add_argument("--memory-runs", type=int, help="runs of the untimed peak memory pass (default: --concurrency)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    names = WORKFLOWS if args.workflow == "all" else (args.workflow,)
+    report = [run_workflow(name, args) for name in names]
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Headless digest precomputation, without Streamlit.
+
+Configuration comes from the environment:
+    DIGEST_LLM_PROVIDER   Groq, OpenAI or Gemini (default: Groq)
+    DIGEST_LLM_MODEL      model name for that provider (default: first model in config.ini)
+    GROQ_API_KEY / OPENAI_API_KEY / GOOGLE_API_KEY, TAVILY_API_KEY
+    AI_NEWS_METRICS_PORT  optional port for /metrics (Prometheus) and /metrics.json
+
+Usage:
+    python -m src.headless --once                  # compute every digest now and exit
+    python -m src.headless --once --frequency daily
+    python -m src.headless                         # keep refreshing digests on the schedule
+"""
+import argparse
+import logging
+import os
+import threading
+
+from dotenv import load_dotenv
+from src.ui.config import Config
+from src.workflow.llms.providers import LLM_PROVIDERS, build_chat_model
+from src.workflow.metrics.metrics import start_metrics_server
+from src.workflow.scheduler.digest_scheduler import DigestScheduler, DIGEST_REFRESH_INTERVALS
+from src.workflow.store.digest_store import get_digest_store
+
+logger = logging.getLogger(__name__)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def build_model_from_env():
+    """
+    This function creates the chat model for headless runs from environment variables.
+    """
+    provider_name = os.environ.get("DIGEST_LLM_PROVIDER", "Groq")
+    provider = LLM_PROVIDERS[provider_name]
+    model_name = os.environ.get("DIGEST_LLM_MODEL")
+    if not model_name:
+        config = Config()
+        model_name = getattr(config, f"get_{provider_name.lower()}_models")()[0]
+
+    user_selections = {
+        "llm_model": provider_name,
+        "llm_api_key": os.environ.get(provider["api_key_env"], ""),
+        provider["model_field"]: model_name,
+    }
+    return build_chat_model(user_selections)
+
+
+def build_scheduler(frequencies=None):
+    """
+    This function builds a digest scheduler around a freshly compiled AI news summarizer graph.
+    """
+    from src.workflow.graphs.ai_news_summarizer_graph import AINewsSummarizerGraph
+
+    model = build_model_from_env()
+    store = get_digest_store()
+    graph = AINewsSummarizerGraph(model=model, store=store).build_graph()
+    intervals = {f: DIGEST_REFRESH_INTERVALS[f] for f in (frequencies or DIGEST_REFRESH_INTERVALS)}
+    return DigestScheduler(graph, store, intervals=intervals)
+
+
+def start_background_scheduler():
+    """
+    This function starts one in-process scheduler per process (used by the UI when AI_NEWS_SCHEDULER=1).
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = build_scheduler()
+            _scheduler.start()
+        return _scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute AI news digests without the Streamlit UI.")
+    parser.add_argument("--once", action="store_true", help="compute the digests once and exit")
+    parser.add_argument("--frequency", action="append", choices=list(DIGEST_REFRESH_INTERVALS),
+                        help="limit to this frequency (repeatable)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if os.environ.get("AI_NEWS_METRICS_PORT"):
+        start_metrics_server(int(os.environ["AI_NEWS_METRICS_PORT"]))
+
+    scheduler = build_scheduler(args.frequency)
+    if args.once:
+        for frequency in scheduler.intervals:
+            scheduler.run_once(frequency)
+    else:
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,74 @@
 import streamlit as st
 from src.ui.layout import Layout
-from src.workflow.llms.groq import Groq
-from src.workflow.llms.openai import OpenAI
-from src.workflow.llms.gemini import Gemini
-from src.workflow.graphs.chatbot_graph import Chatbot_graph
-from src.workflow.graphs.chatbot_with_tools_graph import Chatbot_with_tools_graph
-from src.workflow.graphs.ai_news_summarizer_graph import AINewsSummarizerGraph
 from src.ui.display_results import DisplayResults
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from src.ui.graph_display import GraphDisplay
+from src.ui.news_archive import NewsArchive
+from src.ui.history_view import HistoryView
+from src.ui.digest_job_view import JOB_STATE_KEY, DigestJobView
+from src.workflow.cache.ttl_cache import get_ttl_cache
+from src.workflow.cache.lru_cache import get_lru_cache
+from src.workflow.memory.checkpointer import clear_thread, get_checkpointer, load_thread_messages, thread_config
+from src.workflow.cache.resource_pool import get_resource_pool, hash_secret
+from src.workflow.utils.imports import load_object
+from src.workflow.llms.model_info import get_model_name, get_provider_name
+from src.workflow.llms.providers import (
+    LLM_PROVIDERS, build_chat_model, build_failover_chat_model, build_routed_chat_model, failover_api_keys,
+)
+from src.workflow.store.digest_store import get_digest_store
+from src.workflow.store.conversation_store import get_conversation_store
+from src.workflow.scheduler.digest_scheduler import DIGEST_REFRESH_INTERVALS
+from src.workflow.scheduler.digest_jobs import get_digest_job_queue
+from src.headless import start_background_scheduler
+from src.workflow.metrics.metrics import start_metrics_server
+import os
+import time
+import uuid
+
+# Graphs are imported when first selected, like the provider wrappers in LLM_PROVIDERS
+USE_CASE_GRAPHS = {
+    "Chatbot": "src.workflow.graphs.chatbot_graph:Chatbot_graph",
+    "Chatbot with Web Search": "src.workflow.graphs.chatbot_with_tools_graph:Chatbot_with_tools_graph",
+    "AI News Summarizer": "src.workflow.graphs.ai_news_summarizer_graph:AINewsSummarizerGraph",
+}
+
+def messages_to_history(messages):
+    """
+    This function converts checkpointed graph messages into the history entries shown in the UI.
+    """
+    history = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            history.append({"role": "user", "content": message.content})
+        elif isinstance(message, ToolMessage):
+            history.append({"role": "tool", "content": message.content})
+        elif isinstance(message, AIMessage):
+            history.append({"role": "assistant", "content": message.content})
+    return history
+
+def build_use_case_graph(use_case, llm_model, user_selections):
+    """
+    This function compiles the graph for the selected use case against the shared checkpointer.
+    """
+    # Get the graph based on the user selected use case
+    graph_class = load_object(USE_CASE_GRAPHS[use_case])
+    if use_case == "AI News Summarizer":
+        graph_builder = graph_class(model=llm_model, multi_frequency=bool(user_selections.get("multi_frequency")))
+    elif use_case == "Chatbot" and user_selections.get("semantic_cache"):
+        # Imported only when enabled, so NumPy is not loaded otherwise
+        from src.workflow.cache.semantic_cache import get_semantic_cache
+        graph_builder = graph_class(
+            model=llm_model,
+            context_token_budget=user_selections["context_token_budget"],
+            semantic_cache=get_semantic_cache(),
+        )
+    else:
+        graph_builder = graph_class(model=llm_model, context_token_budget=user_selections["context_token_budget"])
+
+    graph = graph_builder.build_graph(checkpointer=get_checkpointer())
+    # Drawing is only for the server log, so it happens once per compiled graph and off the request path
+    GraphDisplay().display_graph_in_background(graph)
+    return graph
 
 def load_layout():
     """
@@ -29,21 +89,80 @@ def load_layout():
         st.error("Error: Use case is not selected")
         return
 
-    # Initialize chat history for each use case
+    # Per-run trace of node, LLM and tool timings, tokens and cost
+    if user_selections.get("show_trace") and st.session_state.get(f"trace_{use_case}"):
+        with st.sidebar.expander("Last run trace", expanded=True):
+            st.dataframe(st.session_state[f"trace_{use_case}"], hide_index=True)
+
+    # Optionally expose Prometheus metrics on a side port
+    if os.environ.get("AI_NEWS_METRICS_PORT"):
+        start_metrics_server(int(os.environ["AI_NEWS_METRICS_PORT"]))
+
+    # Optionally keep the digests precomputed by an in-process scheduler
+    if os.environ.get("AI_NEWS_SCHEDULER") == "1":
+        try:
+            start_background_scheduler()
+        except Exception as e:
+            st.sidebar.warning(f"Digest scheduler not started: {e}")
+
+    # Each use case has its own checkpointed thread; the id lives in the URL so it survives restarts
+    if "thread" not in st.query_params:
+        st.query_params["thread"] = uuid.uuid4().hex
+    thread_id = f"{st.query_params['thread']}-{use_case}"
+
+    # Histories live in the server-side conversation store; session state only keeps the handle
     history_key = f"messages_{use_case}"
+    history = get_conversation_store().history(thread_id)
+    if user_selections.get("clear_history"):
+        history.clear()
+        clear_thread(thread_id)
     if history_key not in st.session_state:
-        st.session_state[history_key] = []
+        # Chats kept only by the checkpointer (e.g. from before the store existed) are restored from it
+        if not len(history) and use_case != "AI News Summarizer":
+            history.extend(messages_to_history(load_thread_messages(thread_id)))
+        st.session_state[history_key] = thread_id
+
+    if user_selections.get("failover"):
+        # Latency and circuit state of every provider the failover model has called
+        from src.workflow.llms.provider_health import provider_health
+        for provider_name, health in provider_health.snapshot().items():
+            p50 = f"{health['p50_s']:.2f}s" if health["p50_s"] is not None else "n/a"
+            st.sidebar.caption(f"{provider_name}: {health['circuit']}, p50 {p50}, {health['error_rate']:.0%} errors")
+
+    if user_selections.get("routing"):
+        # The tier pair of the selected provider, how the router has split the calls so far, and its latest decision
+        from src.workflow.llms.model_router import model_router
+        small_model = user_selections["router_models"].get(user_selections["llm_model"])
+        large_model = user_selections.get(LLM_PROVIDERS[user_selections["llm_model"]]["model_field"], "")
+        if small_model:
+            st.sidebar.caption(f"Routing tiers: {small_model} (small) / {large_model} (large)")
+        else:
+            st.sidebar.caption(f"Routing: no small model configured for {user_selections['llm_model']}")
+        routed = model_router.snapshot()["decisions"]
+        if routed:
+            st.sidebar.caption("Routing: " + ", ".join(f"{name} {count}" for name, count in routed.items()))
+            last = model_router.decisions(limit=1)[0]
+            st.sidebar.caption(f"Last call: {last['model']} ({last['reason']}, ~{last['tokens']} tokens)")
 
     # Display logic
     if use_case == "AI News Summarizer":
+        # Report how often the shared news search cache saved a Tavily round trip
+        search_cache_stats = get_ttl_cache("tavily_news").stats()
+        st.sidebar.caption(f"News search cache: {search_cache_stats['hits']} hits / {search_cache_stats['misses']} misses")
+        summary_cache_stats = get_lru_cache("news_summaries").stats()
+        st.sidebar.caption(f"Summary cache: {summary_cache_stats['hits']} hits / {summary_cache_stats['misses']} misses")
+
+        # Past digests and articles are served from the local store instead of a new fetch
+        NewsArchive().display()
+
+        # A digest being computed in the background is shown until it lands in the history
+        DigestJobView(history, use_case).display()
+
         # Display "Latest" for AI News Summarizer if it exists at the top
-        latest_news = None
-        if st.session_state[history_key]:
-            for msg in reversed(st.session_state[history_key]):
-                if msg["role"] == "assistant":
-                    latest_news = msg["content"]
-                    break
-                    
+        history_view = HistoryView(history, history_key, page_size=user_selections["history_page_size"])
+        latest_index = history_view.latest_index()
+        latest_news = history[latest_index]["content"] if latest_index is not None else None
+
         if latest_news:
             st.subheader(f"Latest {use_case} Result")
             with st.chat_message("assistant"):
@@ -57,29 +176,25 @@ def load_layout():
                 )
             st.divider()
 
-        # Display remaining history for AI News Summarizer (reversed so latest FETCH is at top)
+        # Display remaining history for AI News Summarizer (reversed so latest FETCH is at top), a page at a time
         st.subheader("Previous Summaries")
-        curr_latest = latest_news # local copy for history loop
-        for message in reversed(st.session_state[history_key]):
-            # Skip the latest news if we already displayed it at top
-            if curr_latest and message["role"] == "assistant" and message["content"] == curr_latest:
-                curr_latest = None 
-                continue
-            
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+        history_view.display_summaries(skip_index=latest_index)
     else:
-        # Standard Chatbot display (Chronological: Top to Bottom)
-        for message in st.session_state[history_key]:
-            if message["role"] == "tool":
-                with st.expander("🔧 View Tool Execution Details"):
-                    st.markdown(f"**Tool Output:**\n{message['content']}")
-            else:
-                # Don't display empty assistant messages (bubbles for tool calls)
-                if message["role"] == "assistant" and not message["content"]:
-                    continue
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
+        if use_case == "Chatbot with Web Search":
+            # Report how often the shared web search cache answered a tool call
+            web_cache_stats = get_ttl_cache("web_search").stats()
+            st.sidebar.caption(f"Web search cache: {web_cache_stats['hits']} hits / {web_cache_stats['misses']} misses")
+
+        if use_case == "Chatbot" and user_selections.get("semantic_cache"):
+            from src.workflow.cache.semantic_cache import get_semantic_cache
+            semantic_stats = get_semantic_cache().stats()
+            st.sidebar.caption(
+                f"Semantic cache: {semantic_stats['hit_rate']:.0%} hit rate, "
+                f"{semantic_stats['mean_lookup_ms']:.1f} ms per lookup, {semantic_stats['entries']} entries"
+            )
+
+        # Standard Chatbot display (Chronological: Top to Bottom), newest page only
+        HistoryView(history, history_key, page_size=user_selections["history_page_size"]).display_chat()
 
     # Determine user input source
     user_input = None
@@ -99,74 +214,83 @@ def load_layout():
 
         try:
             # Get the model from user selection
-            if user_selections["llm_model"] == "Groq":
-                llm_object = Groq(user_selections=user_selections)
-                model_key = f"{user_selections.get('groq_model', '')}_{user_selections.get('llm_api_key', '')}"
-            
-            elif user_selections["llm_model"] == "OpenAI":
-                llm_object = OpenAI(user_selections=user_selections)
-                model_key = f"{user_selections.get('openai_model', '')}_{user_selections.get('llm_api_key', '')}"
-            
-            elif user_selections["llm_model"] == "Gemini":
-                llm_object = Gemini(user_selections=user_selections)
-                model_key = f"{user_selections.get('gemini_model', '')}_{user_selections.get('llm_api_key', '')}"
-
-            if "current_model_key" not in st.session_state or st.session_state.current_model_key != model_key:
-                st.session_state.llm_model = llm_object.get_model()
-                st.session_state.current_model_key = model_key
-            
-            if not st.session_state.llm_model:
+            provider = LLM_PROVIDERS[user_selections["llm_model"]]
+            model_name = user_selections.get(provider["model_field"], '')
+
+            # LLM clients and compiled graphs are shared by every session with the same provider, model and key
+            failover = bool(user_selections.get("failover"))
+            routing = bool(user_selections.get("routing"))
+            # Failover chains are only shared by sessions whose failover keys match as well
+            fallback_keys = failover_api_keys(user_selections, user_selections["failover_models"]) if failover else {}
+            model_key = (
+                user_selections["llm_model"], model_name, hash_secret(user_selections.get('llm_api_key', '')), failover, routing,
+                tuple(sorted((provider_name, hash_secret(api_key)) for provider_name, api_key in fallback_keys.items())),
+            )
+            if routing:
+                build_model = lambda: build_routed_chat_model(
+                    user_selections, user_selections["router_models"], user_selections["failover_models"] if failover else None
+                )
+            elif failover:
+                build_model = lambda: build_failover_chat_model(user_selections, user_selections["failover_models"])
+            else:
+                build_model = lambda: build_chat_model(user_selections)
+            llm_model = get_resource_pool("llm_clients").get_or_create(model_key, build_model)
+            if not llm_model:
                 return
 
-            # Create a unique key for the current configuration (model + use case)
-            config_key = f"{model_key}_{use_case}"
-            
-            # Check if we need to rebuild the graph
-            if "chatbot_graph" not in st.session_state or st.session_state.get("current_config_key") != config_key:
-                try:
-                    # Get the graph based on the user selected use case
-                    if use_case == "Chatbot":
-                        graph_builder = Chatbot_graph(model=st.session_state.llm_model)
-                        st.session_state.chatbot_graph = graph_builder.build_graph()
-                        GraphDisplay().display_graph(st.session_state.chatbot_graph)
-                    
-                    elif use_case == "Chatbot with Web Search":
-                        graph_builder = Chatbot_with_tools_graph(model=st.session_state.llm_model)
-                        st.session_state.chatbot_graph = graph_builder.build_graph()
-                        GraphDisplay().display_graph(st.session_state.chatbot_graph)
-
-                    elif use_case == "AI News Summarizer":
-                        graph_builder = AINewsSummarizerGraph(model=st.session_state.llm_model)
-                        st.session_state.chatbot_graph = graph_builder.build_graph()
-                        GraphDisplay().display_graph(st.session_state.chatbot_graph)
-                    
-                    st.session_state.current_config_key = config_key
-                except Exception as e:
-                    st.error(f"Error: Failed to build chatbot graph: {e}")
-                    return
+            # Serve a fresh digest instantly when the scheduler precomputed one with the same provider and model
+            if use_case == "AI News Summarizer":
+                frequency = user_input.lower()
+                precomputed = get_digest_store().latest_digest(
+                    frequency, max_age=DIGEST_REFRESH_INTERVALS.get(frequency), source="scheduler",
+                    provider=get_provider_name(llm_model), model=get_model_name(llm_model),
+                )
+                if precomputed:
+                    age_minutes = int((time.time() - precomputed["created_at"]) // 60)
+                    history.append({"role": "user", "content": f"Fetching {user_input} Latest AI News"})
+                    history.append({
+                        "role": "assistant",
+                        "content": f"_Precomputed by the digest scheduler {age_minutes} min ago with {precomputed['model']}._\n\n"
+                                   + precomputed["summary"],
+                    })
+                    st.rerun()
 
-            chatbot_graph = st.session_state.chatbot_graph
+            # Create a unique key for the current configuration (model + use case + tool key)
+            config_key = model_key + (
+                use_case,
+                hash_secret(os.environ.get("TAVILY_API_KEY")),
+                user_selections["context_token_budget"],
+                bool(user_selections.get("semantic_cache")),
+                bool(user_selections.get("multi_frequency")),
+            )
+            try:
+                chatbot_graph = get_resource_pool("graphs").get_or_create(
+                    config_key, lambda: build_use_case_graph(use_case, llm_model, user_selections)
+                )
+            except Exception as e:
+                st.error(f"Error: Failed to build chatbot graph: {e}")
+                return
+
+            if use_case == "AI News Summarizer":
+                # Digests run on the background job queue; identical jobs (same frequency and model) are joined
+                frequency = user_input.lower()
+                st.session_state[JOB_STATE_KEY] = get_digest_job_queue().submit((frequency,) + config_key, chatbot_graph, frequency)
+                history.append({"role": "user", "content": f"Fetching {user_input} Latest AI News"})
+                st.rerun()
 
             try:
-                # Prepare messages for the graph including history
-                chat_history = []
-                for m in st.session_state[history_key]:
-                    if m["role"] == "user":
-                        chat_history.append(HumanMessage(content=m["content"]))
-                    elif m["role"] == "tool":
-                        chat_history.append(ToolMessage(content=m["content"], tool_call_id="unknown"))
-                    else:
-                        chat_history.append(AIMessage(content=m["content"]))
-                
-                # Add current user input
-                chat_history.append(HumanMessage(content=user_input))
+                # The checkpointer already holds this thread's history, so only the new message is sent
+                chat_history = [HumanMessage(content=user_input)]
 
                 # Display the results
-                display_results = DisplayResults(use_case=use_case, workflow=chatbot_graph, user_input=user_input)
+                display_results = DisplayResults(
+                    use_case=use_case, workflow=chatbot_graph, user_input=user_input, config=thread_config(thread_id)
+                )
                 
                 # Update session state with the new messages
-                st.session_state[history_key].append({"role": "user", "content": user_input if use_case != "AI News Summarizer" else f"Fetching {user_input} Latest AI News"})
-                st.session_state[history_key].extend(display_results.display(chat_history))
+                history.append({"role": "user", "content": user_input})
+                history.extend(display_results.display(chat_history))
+                st.session_state[f"trace_{use_case}"] = display_results.metrics_handler.trace
                 # Rerun the app to display the new messages
                 st.rerun()
                 
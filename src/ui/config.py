@@ -21,4 +21,18 @@ class Config:
         return self.config["DEFAULT"]["GEMINI_MODELS"].split(",")
 
     def get_openai_models(self):
-        return self.config["DEFAULT"]["OPENAI_MODELS"].split(",")
\ No newline at end of file
+        return self.config["DEFAULT"]["OPENAI_MODELS"].split(",")
+
+    def get_context_token_budget(self):
+        return int(self.config["DEFAULT"]["CONTEXT_TOKEN_BUDGET"])
+
+    def get_history_page_size(self):
+        return int(self.config["DEFAULT"]["HISTORY_PAGE_SIZE"])
+
+    def get_failover_models(self):
+        # "Provider:model" pairs, in failover order
+        return dict(pair.split(":", 1) for pair in self.config["DEFAULT"]["FAILOVER_MODELS"].split(","))
+
+    def get_router_models(self):
+        # "Provider:small model" entries; the model selected in the sidebar is the long-context tier
+        return dict(entry.split(":", 1) for entry in self.config["DEFAULT"]["ROUTER_MODELS"].split(","))
@@ -0,0 +1,44 @@
+import streamlit as st
+from src.workflow.scheduler.digest_jobs import get_digest_job_queue
+
+# Session state key of the digest job this session waits for
+JOB_STATE_KEY = "digest_job"
+
+
+class DigestJobView:
+    """
+    This class shows the progress of this session's background digest job and files its result into the history.
+    """
+    def __init__(self, history, use_case):
+        self.history = history
+        self.use_case = use_case
+
+    def display(self):
+        if JOB_STATE_KEY in st.session_state:
+            _poll_digest_job(self.history, self.use_case)
+        error = st.session_state.pop(f"{JOB_STATE_KEY}_error", None)
+        if error:
+            st.error(f"Error executing graph: {error}")
+
+
+@st.fragment(run_every=1)
+def _poll_digest_job(history, use_case):
+    # Only this fragment reruns while the job is in progress, not the whole page
+    job = get_digest_job_queue().get(st.session_state[JOB_STATE_KEY])
+    if job is None:
+        st.session_state.pop(JOB_STATE_KEY, None)
+        return
+    if job["status"] in ("queued", "running"):
+        with st.chat_message("assistant"):
+            st.caption(f"{job['stage']}... ({job['elapsed']:.0f}s)")
+            if job["partial"]:
+                st.markdown(job["partial"] + "▌")
+        return
+
+    st.session_state.pop(JOB_STATE_KEY, None)
+    st.session_state[f"trace_{use_case}"] = job["trace"]
+    if job["status"] == "done":
+        history.append({"role": "assistant", "content": job["summary"]})
+    else:
+        st.session_state[f"{JOB_STATE_KEY}_error"] = job["error"]
+    st.rerun()
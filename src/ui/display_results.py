@@ -1,85 +1,92 @@
 import streamlit as st
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, ToolMessage
+from src.workflow.metrics.callbacks import MetricsCallbackHandler
 
 class DisplayResults:
-    def __init__(self,use_case,workflow,user_input):
+    def __init__(self,use_case,workflow,user_input,config=None):
         self.use_case = use_case
         self.workflow = workflow
         self.user_input = user_input
+        # Every node, LLM and tool call of this run is timed and counted; the trace is kept for the sidebar
+        self.metrics_handler = MetricsCallbackHandler(use_case=use_case)
+        self.config = {**(config or {}), "callbacks": [self.metrics_handler]}
 
     def display(self, messages):
         use_case = self.use_case
         workflow = self.workflow
         generated_messages = []
-        
+
         if use_case == "Chatbot":
             full_response = ""
-            # Stream the response from the workflow
-            for event in workflow.stream({"messages": messages}):
-                for value in event.values():
-                    if 'messages' in value:
-                        response_msg = value['messages']
-                        if isinstance(response_msg, list):
-                            response_msg = response_msg[-1]
-                        
-                        # Use a context manager for the assistant message
-                        if isinstance(response_msg, AIMessage):
-                            with st.chat_message("assistant"):
-                                message_placeholder = st.empty()
-                                full_response += response_msg.content
-                                message_placeholder.markdown(full_response)
-                                generated_messages.append({"role": "assistant", "content": response_msg.content})
-            
+            reply_id = None
+            with st.chat_message("assistant"):
+                message_placeholder = st.empty()
+                # Stream the tokens of the reply as the model generates them; only the chatbot node's reply is shown
+                for chunk, metadata in workflow.stream({"messages": messages}, config=self.config, stream_mode="messages"):
+                    if metadata.get("langgraph_node") != "chatbot" or not isinstance(chunk, AIMessage):
+                        continue
+                    reply_id = reply_id or chunk.id
+                    if chunk.id == reply_id and chunk.content:
+                        full_response += chunk.content
+                        message_placeholder.markdown(full_response + "▌")
+                message_placeholder.markdown(full_response)
+            generated_messages.append({"role": "assistant", "content": full_response})
+
             return generated_messages
 
         elif use_case == "Chatbot with Web Search":
-            # Stream the response from the workflow
-            for event in workflow.stream({"messages": messages}):
-                for value in event.values():
-                    if 'messages' in value:
-                        msg_data = value['messages']
-                        if isinstance(msg_data, list):
-                            msg_to_process = msg_data[-1]
-                        else:
-                            msg_to_process = msg_data
-                        
-                        # Use expander for tool outputs
-                        if isinstance(msg_to_process, ToolMessage):
-                            with st.expander("🔧 View Tool Execution Details"):
-                                st.markdown(f"**Tool Output:**\n{msg_to_process.content}")
-                            generated_messages.append({"role": "tool", "content": msg_to_process.content})
+            streamed = _StreamedAIMessage()
+            # Stream the tokens of every model call and the tool outputs between them
+            for chunk, metadata in workflow.stream({"messages": messages}, config=self.config, stream_mode="messages"):
+                # Use expander for tool outputs
+                if isinstance(chunk, ToolMessage):
+                    generated_messages.extend(streamed.finish())
+                    with st.expander("🔧 View Tool Execution Details"):
+                        st.markdown(f"**Tool Output:**\n{chunk.content}")
+                    generated_messages.append({"role": "tool", "content": chunk.content})
+
+                elif isinstance(chunk, AIMessage):
+                    # A new message id means the previous model call has finished
+                    if streamed.message is not None and chunk.id != streamed.message.id:
+                        generated_messages.extend(streamed.finish())
+                    streamed.add(chunk)
 
-                        # Use a context manager for the assistant message
-                        if isinstance(msg_to_process, AIMessage):
-                            # Record the message in history regardless of content if it has tool calls
-                            # Or if it has content, display and record it.
-                            if msg_to_process.content:
-                                with st.chat_message("assistant"):
-                                    message_placeholder = st.empty()
-                                    message_placeholder.markdown(msg_to_process.content)
-                                generated_messages.append({"role": "assistant", "content": msg_to_process.content})
-                            elif msg_to_process.tool_calls:
-                                # We add it to history but don't necessarily need a UI bubble for an empty tool call
-                                generated_messages.append({"role": "assistant", "content": ""}) 
-                        
+            generated_messages.extend(streamed.finish())
             return generated_messages
 
-        elif use_case == "AI News Summarizer":
-            frequency = self.user_input
-            with st.spinner(f"Fetching and summarising the news for {frequency}..."):
-                # The workflow invoke returns the final state
-                response_state = workflow.invoke({"messages": messages})
-                summary = response_state.get("summary", "")
-                
-                if summary:
-                    # Capture the summary but don't display it here if we want it at the top in main.py
-                    # Actually, if I display it here, it will be at the bottom of where main calls it.
-                    # I'll return it so main.py can choose.
-                    generated_messages.append({"role": "assistant", "content": summary})
-                    return generated_messages
-                else:
-                    st.error("Error: Failed to generate AI news summary.")
-                    return []
-                
-                
-        
\ No newline at end of file
+
+class _StreamedAIMessage:
+    """
+    This class accumulates the chunks of one streamed assistant message into a chat bubble.
+    """
+    def __init__(self):
+        self.message = None
+        self.placeholder = None
+
+    def add(self, chunk):
+        if isinstance(self.message, AIMessageChunk) and isinstance(chunk, AIMessageChunk):
+            self.message = self.message + chunk
+        else:
+            self.message = chunk
+        if self.message.content:
+            # Only open a chat bubble once there is text to show (tool calls have none)
+            if self.placeholder is None:
+                with st.chat_message("assistant"):
+                    self.placeholder = st.empty()
+            self.placeholder.markdown(self.message.content + "▌")
+
+    def finish(self):
+        """
+        This function closes the current message and returns it as history entries.
+        """
+        message, self.message = self.message, None
+        placeholder, self.placeholder = self.placeholder, None
+        if message is None:
+            return []
+        if message.content:
+            placeholder.markdown(message.content)
+            return [{"role": "assistant", "content": message.content}]
+        if message.tool_calls or getattr(message, "tool_call_chunks", None):
+            # We add it to history but don't need a UI bubble for an empty tool call
+            return [{"role": "assistant", "content": ""}]
+        return []
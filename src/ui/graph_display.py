@@ -1,3 +1,5 @@
+import threading
+
 class GraphDisplay:
     def __init__(self):
         pass
@@ -6,4 +8,10 @@ class GraphDisplay:
     def display_graph(self, graph):
         # Image(graph.get_graph().draw_mermaid_png())
         print(graph.get_graph().draw_ascii())
-        # print(graph.get_graph().draw_mermaid())
\ No newline at end of file
+        # print(graph.get_graph().draw_mermaid())
+
+    def display_graph_in_background(self, graph):
+        """
+        This function draws the graph on a daemon thread so the request path does not wait for the layout.
+        """
+        threading.Thread(target=self.display_graph, args=(graph,), daemon=True).start()
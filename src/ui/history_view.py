@@ -0,0 +1,77 @@
+import streamlit as st
+
+
+class HistoryView:
+    """
+    This class renders a use case's history a window at a time, so a rerun only draws the newest entries.
+    Older entries are added on demand, and tool outputs are only rendered when opened.
+    """
+    def __init__(self, history, history_key, page_size=20):
+        """
+        history is the list-like history to show; history_key namespaces this view's widget and state keys.
+        """
+        self.history = history
+        self.history_key = history_key
+        self.page_size = page_size
+        self._visible_key = f"{history_key}_visible"
+        self._latest_key = f"{history_key}_latest"
+
+    def latest_index(self, role="assistant"):
+        """
+        This function returns the index of the newest entry with the role, or None.
+        History only grows between clears, so only the entries added since the last call are scanned.
+        """
+        scanned, latest = st.session_state.get(self._latest_key, (0, None))
+        if scanned > len(self.history):
+            scanned, latest = 0, None
+        for index in range(scanned, len(self.history)):
+            if self.history[index]["role"] == role:
+                latest = index
+        st.session_state[self._latest_key] = (len(self.history), latest)
+        return latest
+
+    def visible_start(self):
+        """
+        This function returns the index of the oldest entry in the window.
+        """
+        return max(0, len(self.history) - st.session_state.get(self._visible_key, self.page_size))
+
+    def load_more(self, start):
+        """
+        This function offers a button that widens the window by one page when older entries are hidden.
+        """
+        if start and st.button(f"Load {min(start, self.page_size)} earlier entries", key=f"{self.history_key}_load_more"):
+            st.session_state[self._visible_key] = len(self.history) - start + self.page_size
+            st.rerun()
+
+    def display_chat(self):
+        """
+        This function shows the newest chat messages, oldest first.
+        """
+        start = self.visible_start()
+        self.load_more(start)
+        for index in range(start, len(self.history)):
+            message = self.history[index]
+            if message["role"] == "tool":
+                # The output body is only sent to the browser once the user opens it
+                if st.toggle("🔧 View Tool Execution Details", key=f"{self.history_key}_tool_{index}"):
+                    st.markdown(f"**Tool Output:**\n{message['content']}")
+            else:
+                # Don't display empty assistant messages (bubbles for tool calls)
+                if message["role"] == "assistant" and not message["content"]:
+                    continue
+                with st.chat_message(message["role"]):
+                    st.markdown(message["content"])
+
+    def display_summaries(self, skip_index=None):
+        """
+        This function shows the newest history entries, newest first, leaving out the one at skip_index.
+        """
+        start = self.visible_start()
+        for index in range(len(self.history) - 1, start - 1, -1):
+            if index == skip_index:
+                continue
+            message = self.history[index]
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+        self.load_more(start)
@@ -14,6 +14,11 @@ class Layout:
         if "IS_AI_NEWS_FETCHED" not in st.session_state:
             st.session_state.IS_AI_NEWS_FETCHED = False
 
+        # Token budget for the chat context sent to the model
+        self.user_selections["context_token_budget"] = self.config.get_context_token_budget()
+        # Number of history entries drawn per page
+        self.user_selections["history_page_size"] = self.config.get_history_page_size()
+
         with st.sidebar:
             # Get the options
             self.user_selections["llm_model"] = st.selectbox("Select LLM Model", self.config.get_llm_models())
@@ -56,12 +61,43 @@ class Layout:
                 st.subheader("AI News Summarizer")
                 with st.sidebar:
                     time_frame = st.selectbox("Select Time Frame", ["Daily", "Weekly", "Monthly"], index=0)
+                    self.user_selections["multi_frequency"] = st.checkbox(
+                        "Summarize all time frames in one run", value=False,
+                        help="Fetches once and builds the daily, weekly and monthly digests in parallel; the others are then served instantly.",
+                    )
                 if st.button("Fetch Latest AI News", use_container_width=True):
                     st.session_state.time_frame = time_frame
                     st.session_state.IS_AI_NEWS_FETCHED = True
             
-            if st.button("Clear Chat History"):
-                st.session_state.messages = []
-                st.rerun()
+            if self.user_selections["use_case"] == "Chatbot":
+                self.user_selections["semantic_cache"] = st.checkbox(
+                    "Reuse answers to similar questions", value=False,
+                    help="Answers a question from a local semantic cache when a near-identical one was asked before.",
+                )
+
+            self.user_selections["failover"] = st.checkbox(
+                "Failover across providers", value=False,
+                help="Hedges slow calls and fails over to the other providers whose API keys you enter below or the server provides.",
+            )
+            self.user_selections["failover_models"] = self.config.get_failover_models()
+            self.user_selections["failover_api_keys"] = {}
+            if self.user_selections["failover"]:
+                # Failover keys belong to this session only; they are never written to the environment
+                for provider_name in self.user_selections["failover_models"]:
+                    if provider_name != self.user_selections["llm_model"]:
+                        self.user_selections["failover_api_keys"][provider_name] = st.text_input(
+                            f"{provider_name} API key for failover (optional)", type="password", key=f"failover_api_key_{provider_name}",
+                        )
+
+            self.user_selections["routing"] = st.checkbox(
+                "Route by prompt size", value=False,
+                help="Sends short requests to a small, fast model of the selected provider and long summarization prompts to the selected model.",
+            )
+            self.user_selections["router_models"] = self.config.get_router_models()
+
+            self.user_selections["show_trace"] = st.checkbox("Show run trace", value=False)
+
+            # main.py clears the selected use case's stored history and thread
+            self.user_selections["clear_history"] = st.button("Clear Chat History")
 
         return self.user_selections
\ No newline at end of file
@@ -0,0 +1,42 @@
+import datetime
+
+import streamlit as st
+from src.workflow.store.digest_store import get_digest_store
+
+
+class NewsArchive:
+    """
+    This class shows past digests and stored articles from the digest store, so old news needs no new fetch.
+    """
+    def __init__(self, store=None, limit=20):
+        self.store = store or get_digest_store()
+        self.limit = limit
+
+    def display(self):
+        with st.expander("📚 News archive"):
+            keyword = st.text_input("Search stored news", key="archive_keyword").strip()
+            today = datetime.date.today()
+            date_range = st.date_input(
+                "Date range", value=(today - datetime.timedelta(days=30), today), key="archive_dates"
+            )
+            # The range is a single date while the user is still picking the end date
+            start, end = (date_range if len(date_range) == 2 else (date_range[0], date_range[0]))
+            since = datetime.datetime.combine(start, datetime.time.min).timestamp()
+            until = datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time.min).timestamp()
+
+            digests_tab, articles_tab = st.tabs(["Digests", "Articles"])
+            with digests_tab:
+                digests = self.store.list_digests(since=since, until=until, keyword=keyword or None, limit=self.limit)
+                if not digests:
+                    st.caption("No stored digests match.")
+                for digest in digests:
+                    created = datetime.datetime.fromtimestamp(digest["created_at"]).strftime("%d-%m-%Y %H:%M")
+                    with st.popover(f"{digest['frequency'].capitalize()} digest, {created}"):
+                        st.markdown(digest["summary"])
+            with articles_tab:
+                articles = self.store.search_articles(keyword or None, since=since, until=until, limit=self.limit)
+                if not articles:
+                    st.caption("No stored articles match.")
+                for article in articles:
+                    published = datetime.datetime.fromtimestamp(article["published_at"]).strftime("%d-%m-%Y")
+                    st.markdown(f"- {published} [{article['title'] or article['url']}]({article['url']})")
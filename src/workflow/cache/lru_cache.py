@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from src.workflow.metrics.metrics import record_cache_lookup
+from src.workflow.paths import data_path
+
+
+class LRUCache:
+    """
+    This class is a bounded, process-wide cache with least-recently-used eviction.
+    A small memory tier sits in front of a larger SQLite tier on disk.
+    """
+    def __init__(self, name, max_items=64, max_disk_items=1024, path=None):
+        self.name = name
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self.path = path or data_path("cache", f"{name}.sqlite")
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        This function returns the cached value for the key, or None if it is not cached.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                record_cache_lookup(self.name, True)
+                return self._memory[key]
+
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                record_cache_lookup(self.name, False)
+                return None
+
+            # Promote the disk entry back into memory
+            value = json.loads(row[0])
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self._remember(key, value)
+            self._hits += 1
+            record_cache_lookup(self.name, True)
+            return value
+
+    def set(self, key, value):
+        """
+        This function stores the value under the key, evicting the least recently used entries.
+        """
+        with self._lock:
+            self._remember(key, value)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, last_access) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_items,),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """
+        This function drops every entry from memory and disk.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self):
+        """
+        This function returns the hit/miss counters of the cache.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "name": self.name,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "memory_items": len(self._memory),
+            }
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_lru_cache(name, **kwargs):
+    """
+    This function returns the shared LRU cache with the given name, creating it on first use.
+    """
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = LRUCache(name, **kwargs)
+        return _caches[name]
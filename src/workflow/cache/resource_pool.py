@@ -0,0 +1,86 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def hash_secret(secret):
+    """
+    This function returns a short, non-reversible fingerprint of an API key for use in pool keys.
+    """
+    return hashlib.sha256((secret or "").encode("utf-8")).hexdigest()[:16]
+
+
+class ResourcePool:
+    """
+    This class shares expensive objects (LLM clients, compiled graphs, tool clients) across sessions.
+    Entries are evicted when unused for idle_ttl seconds or when the pool grows past max_items.
+    """
+    def __init__(self, name, max_items=32, idle_ttl=30 * 60):
+        self.name = name
+        self.max_items = max_items
+        self.idle_ttl = idle_ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_create(self, key, factory):
+        """
+        This function returns the pooled object for the key, building it once with factory() if needed.
+        """
+        with self._lock:
+            self._evict_idle()
+            if key in self._items:
+                return self._touch(key)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Build outside the pool lock so one slow build does not block other keys
+        with key_lock:
+            with self._lock:
+                if key in self._items:
+                    return self._touch(key)
+            resource = factory()
+            with self._lock:
+                self._misses += 1
+                self._key_locks.pop(key, None)
+                # A failed build (None) is not pooled so the next request retries it
+                if resource is None:
+                    return None
+                self._items[key] = [resource, time.monotonic()]
+                while len(self._items) > self.max_items:
+                    self._items.popitem(last=False)
+            return resource
+
+    def stats(self):
+        """
+        This function returns the size and hit/miss counters of the pool.
+        """
+        with self._lock:
+            return {"name": self.name, "items": len(self._items), "hits": self._hits, "misses": self._misses}
+
+    def _touch(self, key):
+        self._hits += 1
+        self._items[key][1] = time.monotonic()
+        self._items.move_to_end(key)
+        return self._items[key][0]
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        for key in [k for k, (_, last_used) in self._items.items() if now - last_used > self.idle_ttl]:
+            del self._items[key]
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_resource_pool(name, **kwargs):
+    """
+    This function returns the shared resource pool with the given name, creating it on first use.
+    """
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = ResourcePool(name, **kwargs)
+        return _pools[name]
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from src.workflow.metrics.metrics import record_cache_lookup
+from src.workflow.paths import data_path
+from src.workflow.utils.text import QUERY_STOPWORDS
+
+# Size of the hashed n-gram embedding; bump the version when the embedding changes so snapshots are re-embedded
+EMBEDDING_DIM = 1024
+EMBEDDING_VERSION = 2
+
+# Words that do not change what a question asks for ("what is RAG" and "explain RAG" ask the same)
+FILLER_WORDS = QUERY_STOPWORDS | {
+    "is", "be", "can", "could", "would", "you", "i", "do", "does", "how", "why", "explain", "describe", "define",
+    "meaning", "mean", "overview", "briefly", "quick", "quickly", "with", "by", "at", "it", "this", "that", "or",
+}
+# Words whose position changes the meaning ("convert C to F" vs "F to C"); prompts with them must match in order
+RELATION_WORDS = {"to", "from", "into", "over", "than", "vs", "versus", "before", "after", "against", "under", "above"}
+
+
+def key_terms(text):
+    """
+    This function returns the words of a prompt that decide its answer, in order: content words
+    (numbers and negations included, plurals folded) and relation words.
+    """
+    words = re.findall(r"\w+", (text or "").lower())
+    terms = []
+    for i, word in enumerate(words):
+        if word == "to" and i and words[i - 1] == "how":
+            continue
+        if word in FILLER_WORDS and word not in RELATION_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+def same_question(terms, other_terms):
+    """
+    This function tells whether two prompts' key terms ask the same question: the same content words,
+    and the same order when either has a relation word.
+    """
+    if {t for t in terms if t not in RELATION_WORDS} != {t for t in other_terms if t not in RELATION_WORDS}:
+        return False
+    if RELATION_WORDS.intersection(terms) or RELATION_WORDS.intersection(other_terms):
+        return terms == other_terms
+    return True
+
+
+def embed(text):
+    """
+    This function embeds a prompt locally as an L2-normalized vector of hashed word and character 3-gram counts
+    of its key terms.
+    """
+    text = " ".join(key_terms(text)) or " ".join(re.findall(r"\w+", (text or "").lower()))
+    features = text.split() + [text[i:i + 3] for i in range(max(0, len(text) - 2))]
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    if not features:
+        return vector
+    indices = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=4).digest(), "big") % EMBEDDING_DIM for f in features]
+    np.add.at(vector, indices, 1.0)
+    return vector / np.linalg.norm(vector)
+
+
+class SemanticCache:
+    """
+    This class returns a stored answer when a new prompt is close enough to a previous one.
+    Prompts are matched by cosine similarity in a bounded in-memory index with a disk snapshot, and a match must
+    also have the same key terms (numbers, negations, content words), so near-identical wordings of different
+    questions never share an answer. Only entries recorded under the same context key (model and conversation
+    context) can match.
+    """
+    def __init__(self, name="chat_responses", capacity=2000, threshold=0.9, snapshot_every=20):
+        self.name = name
+        self.capacity = capacity
+        self.threshold = threshold
+        self.snapshot_every = snapshot_every
+        self.path = data_path("cache", f"semantic_{name}")
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((capacity, EMBEDDING_DIM), dtype=np.float32)
+        self._entries = []
+        self._last_used = np.zeros(capacity, dtype=np.float64)
+        self._unsaved = 0
+        self._hits = 0
+        self._misses = 0
+        self._lookup_seconds = 0.0
+        self._load()
+
+    def lookup(self, prompt, context_key):
+        """
+        This function returns the cached answer for a similar prompt in the same context, or None.
+        """
+        start = time.perf_counter()
+        query = embed(prompt)
+        terms = key_terms(prompt)
+        with self._lock:
+            answer = None
+            candidates = [i for i, entry in enumerate(self._entries) if entry["context"] == context_key]
+            if candidates:
+                similarities = self._vectors[candidates] @ query
+                # Most similar first; the first one above the threshold that asks the same question wins
+                for best in np.argsort(-similarities):
+                    if similarities[best] < self.threshold:
+                        break
+                    index = candidates[best]
+                    if same_question(terms, key_terms(self._entries[index]["prompt"])):
+                        self._last_used[index] = time.time()
+                        answer = self._entries[index]["answer"]
+                        break
+
+            if answer is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            self._lookup_seconds += time.perf_counter() - start
+        record_cache_lookup(self.name, answer is not None)
+        return answer
+
+    def add(self, prompt, answer, context_key):
+        """
+        This function stores an answer, evicting the least recently used entry when the index is full.
+        """
+        vector = embed(prompt)
+        with self._lock:
+            entry = {"prompt": prompt, "answer": answer, "context": context_key}
+            if len(self._entries) < self.capacity:
+                index = len(self._entries)
+                self._entries.append(entry)
+            else:
+                index = int(np.argmin(self._last_used))
+                self._entries[index] = entry
+            self._vectors[index] = vector
+            self._last_used[index] = time.time()
+
+            self._unsaved += 1
+            if self._unsaved >= self.snapshot_every:
+                self._save()
+
+    def stats(self):
+        """
+        This function returns the hit rate and the mean lookup latency of the cache.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "name": self.name,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "mean_lookup_ms": 1000 * self._lookup_seconds / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def _save(self):
+        # Write to temporary files first so a crash never leaves a half-written snapshot
+        count = len(self._entries)
+        np.save(self.path + ".tmp.npy", self._vectors[:count])
+        with open(self.path + ".tmp.json", "w") as f:
+            json.dump({"entries": self._entries, "last_used": self._last_used[:count].tolist(), "version": EMBEDDING_VERSION}, f)
+        os.replace(self.path + ".tmp.npy", self.path + ".npy")
+        os.replace(self.path + ".tmp.json", self.path + ".json")
+        self._unsaved = 0
+
+    def _load(self):
+        if not (os.path.exists(self.path + ".npy") and os.path.exists(self.path + ".json")):
+            return
+        try:
+            vectors = np.load(self.path + ".npy")
+            with open(self.path + ".json") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        count = min(len(snapshot["entries"]), len(vectors), self.capacity)
+        self._entries = snapshot["entries"][:count]
+        if snapshot.get("version") == EMBEDDING_VERSION:
+            self._vectors[:count] = vectors[:count]
+        else:
+            # Written with an older embedding: re-embed the stored prompts
+            for index, entry in enumerate(self._entries):
+                self._vectors[index] = embed(entry["prompt"])
+        self._last_used[:count] = snapshot["last_used"][:count]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache():
+    """
+    This function returns the process-wide semantic response cache.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache()
+        return _cache
@@ -0,0 +1,114 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Stream:
+    def __init__(self):
+        self.changed = threading.Condition()
+        self.items = []
+        self.finished = False
+        self.error = None
+
+    def publish(self, item):
+        with self.changed:
+            self.items.append(item)
+            self.changed.notify_all()
+
+    def finish(self, error=None):
+        with self.changed:
+            self.error = error
+            self.finished = True
+            self.changed.notify_all()
+
+    def __iter__(self):
+        index = 0
+        while True:
+            with self.changed:
+                while index >= len(self.items) and not self.finished:
+                    self.changed.wait()
+                items = self.items[index:]
+                finished, error = self.finished, self.error
+            index += len(items)
+            yield from items
+            if finished:
+                if error is not None:
+                    raise error
+                return
+
+
+class SingleFlight:
+    """
+    This class coalesces identical concurrent calls: while a call for a key is running,
+    other callers with the same key wait for its result instead of starting their own.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._streams = {}
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        This function runs fn() once per key at a time and returns its result to every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def do_stream(self, key, fn):
+        """
+        This function yields the items of the iterable fn() once per key at a time; callers that join
+        a running stream get all of its items from the start. A background thread reads the stream to
+        the end, so every caller sees it complete even if the first one stops early.
+        """
+        with self._lock:
+            stream = self._streams.get(key)
+            leader = stream is None
+            if leader:
+                stream = self._streams[key] = _Stream()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            threading.Thread(target=self._pump, args=(key, stream, fn), daemon=True, name="single-flight-stream").start()
+        return iter(stream)
+
+    def _pump(self, key, stream, fn):
+        error = None
+        try:
+            for item in fn():
+                stream.publish(item)
+        except BaseException as e:
+            error = e
+        finally:
+            # Later callers start a new stream instead of replaying a finished one
+            with self._lock:
+                self._streams.pop(key, None)
+            stream.finish(error)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from src.workflow.metrics.metrics import record_cache_lookup
+from src.workflow.paths import data_path
+
+
+def make_cache_key(*parts, **named_parts):
+    """
+    This function builds a stable cache key from the given parts.
+    """
+    payload = json.dumps([parts, named_parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """
+    This class is a process-wide key/value cache with per-entry expiry.
+    Entries live in memory and in a SQLite file, so they survive Streamlit reruns and restarts.
+    """
+    def __init__(self, name, path=None, max_memory_items=256):
+        self.name = name
+        self.path = path or data_path("cache", f"{name}.sqlite")
+        self.max_memory_items = max_memory_items
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        This function returns the cached value for the key, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[1], json.loads(row[0]))
+                    self._remember(key, entry)
+
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._forget(key)
+                self._misses += 1
+                record_cache_lookup(self.name, False)
+                return None
+
+            self._hits += 1
+            record_cache_lookup(self.name, True)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        """
+        This function stores the value under the key for ttl seconds.
+        """
+        entry = (time.time() + ttl, value)
+        with self._lock:
+            self._remember(key, entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), entry[0]),
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        """
+        This function drops every expired entry from memory and disk.
+        """
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (expires_at, _) in self._memory.items() if expires_at <= now]:
+                del self._memory[key]
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+    def clear(self):
+        """
+        This function drops every entry from memory and disk.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self):
+        """
+        This function returns the hit/miss counters of the cache.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "name": self.name,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "memory_items": len(self._memory),
+            }
+
+    def _remember(self, key, entry):
+        # Keep the memory tier small; the SQLite file holds everything else
+        if key not in self._memory and len(self._memory) >= self.max_memory_items:
+            self._memory.pop(next(iter(self._memory)))
+        self._memory[key] = entry
+
+    def _forget(self, key):
+        self._memory.pop(key, None)
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._conn.commit()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_ttl_cache(name):
+    """
+    This function returns the shared cache with the given name, creating it on first use.
+    """
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = TTLCache(name)
+        return _caches[name]
@@ -3,25 +3,62 @@ from src.workflow.states.chatbot_state import Chatbot_state
 from src.workflow.nodes.ai_news_summarizer_node import AINewsSummarizerNode
 
 class AINewsSummarizerGraph:
-    def __init__(self, model):
+    def __init__(self, model, summary_mode="stuff", article_token_budget=400, max_concurrency=5, queries=None,
+                 tavily_client=None, store=None, multi_frequency=False):
         self.model = model
+        self.summary_mode = summary_mode
+        self.article_token_budget = article_token_budget
+        self.max_concurrency = max_concurrency
+        self.queries = queries
+        self.tavily_client = tavily_client
+        self.store = store
+        self.multi_frequency = multi_frequency
         self.graph = StateGraph(Chatbot_state)
         
-    def build_graph(self):
+    def build_graph(self, checkpointer=None):
         """
         This function builds the graph for the AI news summarizer.
+        Pass a checkpointer to keep each thread's state between runs.
+        In multi-frequency mode one fetch feeds parallel daily, weekly and monthly summarization branches.
         """
 
         # add nodes
-        ai_news_summarizer_node = AINewsSummarizerNode(self.model)
+        ai_news_summarizer_node = AINewsSummarizerNode(
+            self.model,
+            summary_mode=self.summary_mode,
+            article_token_budget=self.article_token_budget,
+            max_concurrency=self.max_concurrency,
+            queries=self.queries,
+            tavily_client=self.tavily_client,
+            store=self.store,
+        )
+        if self.multi_frequency:
+            self.graph.add_node("fetch_ai_news", ai_news_summarizer_node.fetch_all_frequencies)
+            self.graph.add_node("compress_articles", ai_news_summarizer_node.compress_articles)
+            self.graph.add_node("summarize_frequency", ai_news_summarizer_node.summarize_frequency)
+            self.graph.add_node("save_ai_results", ai_news_summarizer_node.save_all_results)
+
+            # fan out one branch per frequency, then fan in to a single save
+            self.graph.set_entry_point("fetch_ai_news")
+            self.graph.add_edge("fetch_ai_news", "compress_articles")
+            self.graph.add_conditional_edges(
+                "compress_articles", ai_news_summarizer_node.route_frequencies, ["summarize_frequency"]
+            )
+            self.graph.add_edge("summarize_frequency", "save_ai_results")
+            self.graph.add_edge("save_ai_results", END)
+            return self.graph.compile(checkpointer=checkpointer)
+
         self.graph.add_node("fetch_ai_news", ai_news_summarizer_node.fetch_ai_news)
+        self.graph.add_node("compress_articles", ai_news_summarizer_node.compress_articles)
         self.graph.add_node("summarize_ai_news", ai_news_summarizer_node.summarize_ai_news)
         self.graph.add_node("save_ai_results", ai_news_summarizer_node.save_ai_results)
 
         # add edges
         self.graph.set_entry_point("fetch_ai_news")
-        self.graph.add_edge("fetch_ai_news", "summarize_ai_news")
-        self.graph.add_edge("summarize_ai_news", END)
+        self.graph.add_edge("fetch_ai_news", "compress_articles")
+        self.graph.add_edge("compress_articles", "summarize_ai_news")
+        self.graph.add_edge("summarize_ai_news", "save_ai_results")
+        self.graph.add_edge("save_ai_results", END)
         
-        return self.graph.compile()
+        return self.graph.compile(checkpointer=checkpointer)
         
\ No newline at end of file
@@ -1,22 +1,27 @@
 from langgraph.graph import StateGraph, START, END
 from src.workflow.states.chatbot_state import Chatbot_state
 from src.workflow.nodes.chatbot_node import Chatbot_node
+from src.workflow.memory.context_window import ContextWindow
 
 
 class Chatbot_graph:
     """
     This class is used to build the chatbot graph.
     """
-    def __init__(self, model):
+    def __init__(self, model, context_token_budget=None, semantic_cache=None):
         self.model = model
+        self.context_token_budget = context_token_budget
+        self.semantic_cache = semantic_cache
         self.graph = StateGraph(Chatbot_state)
 
-    def build_graph(self):
+    def build_graph(self, checkpointer=None):
         """
         This function builds the chatbot graph.
+        Pass a checkpointer to keep each thread's messages between runs.
         """
-        self.chatbot_node = Chatbot_node(self.model)
+        context_window = ContextWindow(self.model, self.context_token_budget) if self.context_token_budget else None
+        self.chatbot_node = Chatbot_node(self.model, context_window=context_window, semantic_cache=self.semantic_cache)
         self.graph.add_node("chatbot", self.chatbot_node.process)
         self.graph.add_edge(START, "chatbot")
         self.graph.add_edge("chatbot", END)
-        return self.graph.compile()
\ No newline at end of file
+        return self.graph.compile(checkpointer=checkpointer)
\ No newline at end of file
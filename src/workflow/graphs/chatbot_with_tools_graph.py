@@ -1,25 +1,31 @@
 from langgraph.graph import StateGraph, START, END
 from src.workflow.states.chatbot_state import Chatbot_state
 from src.workflow.nodes.chatbot_node import Chatbot_node
+from src.workflow.memory.context_window import ContextWindow
 from src.workflow.nodes.tools_node import Tools_node
 from src.workflow.tools.tools import get_tools
 from langgraph.prebuilt import tools_condition
 
 class Chatbot_with_tools_graph:
-    def __init__(self, model):
+    def __init__(self, model, context_token_budget=None, tools=None):
         self.model = model
+        self.tools = tools
+        self.context_token_budget = context_token_budget
         self.graph = StateGraph(Chatbot_state)
 
-    def build_graph(self):
+    def build_graph(self, checkpointer=None):
         """
         This function builds the graph for the chatbot with tools.
+        Pass a checkpointer to keep each thread's messages between runs.
         """
-        tools = get_tools()
+        tools = self.tools or get_tools()
+        # The running summary is written by the plain model, before tools are bound
+        context_window = ContextWindow(self.model, self.context_token_budget) if self.context_token_budget else None
         # get the chatbot node
         self.model = self.model.bind_tools(tools)
-        self.chatbot_node = Chatbot_node(self.model)
+        self.chatbot_node = Chatbot_node(self.model, context_window=context_window)
         # get the tools node
-        self.tools_node = Tools_node(get_tools())
+        self.tools_node = Tools_node(tools)
 
         # add nodes to the graph
         self.graph.add_node("chatbot", self.chatbot_node.process)
@@ -30,4 +36,4 @@ class Chatbot_with_tools_graph:
         self.graph.add_conditional_edges("chatbot",tools_condition)
         self.graph.add_edge("tools", "chatbot")
         self.graph.add_edge("chatbot", END)
-        return self.graph.compile()
+        return self.graph.compile(checkpointer=checkpointer)
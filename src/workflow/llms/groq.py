@@ -1,6 +1,7 @@
-from langchain_groq import ChatGroq
+import logging
 import os
-import streamlit as st
+
+logger = logging.getLogger(__name__)
 
 class Groq:
     def __init__(self, user_selections):
@@ -10,18 +11,15 @@ class Groq:
         try:
             api_key = self.user_selections["llm_api_key"]
             if api_key == "" or os.environ.get("GROQ_API_KEY") == "":
-                st.error("Please enter your API key")
-                return None 
+                raise ValueError("Please enter your API key") 
             model_name = self.user_selections["groq_model"]
             if model_name == "":
-                st.error("Please enter your model name")
-                return None
+                raise ValueError("Please enter your model name")
+            # Imported on first use so only the selected provider's SDK is loaded
+            from langchain_groq import ChatGroq
             model = ChatGroq(api_key=api_key, model_name=model_name)
-            st.success("Groq model loaded successfully")
+            logger.info("Groq model %s loaded successfully", model_name)
             return model
         except Exception as e:
-            st.error(f"Error loading Groq model: {e}")
+            logger.error("Error loading Groq model: %s", e)
             raise ValueError(f"Error loading Groq model {e}")
-
-
-
@@ -0,0 +1,139 @@
+import time
+from itertools import chain
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from src.workflow.llms.model_info import get_model_name
+from src.workflow.llms.provider_health import provider_health
+
+# The provider models run without callbacks; this wrapper reports the call once
+_NO_CALLBACKS = {"callbacks": []}
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedged-llm")
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    This class sends each call to the primary provider and, if it has not answered within that provider's
+    p95 latency, a duplicate to the next provider; the first answer (for streams, the first chunk) wins.
+    Failed calls fail over to the next provider right away, and providers with an open circuit breaker are skipped.
+    models holds one ResilientChatModel per provider, primary first.
+    """
+    models: List[Any]
+    model_name: str = ""
+    # Bounds of the hedge delay, in seconds, and its value before enough latency samples exist
+    min_hedge_delay: float = 1.0
+    default_hedge_delay: float = 4.0
+
+    @classmethod
+    def wrap(cls, models):
+        return cls(models=models, model_name=get_model_name(models[0]))
+
+    @property
+    def _llm_type(self):
+        return "hedged"
+
+    def _get_ls_params(self, stop=None, **kwargs):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_provider"] = self.models[0].provider
+        params["ls_model_name"] = self.model_name
+        return params
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"models": [model.bind_tools(tools, **kwargs) for model in self.models]})
+
+    def _candidates(self):
+        # Skip providers whose circuit is open, but never end up with nothing to call
+        return [model for model in self.models if provider_health.allow(model.provider)] or self.models[:1]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        message, _ = self._race(lambda model: _timed_invoke(model, messages, stop, kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        # The race is on the first chunk: a slow stream is hedged and a failed one fails over;
+        # the winning stream is then read to the end and the losers are closed
+        (first, stream), _ = self._race(lambda model: _open_stream(model, messages, stop, kwargs), discard=_close_stream)
+        if first is None:
+            return
+        for message_chunk in chain([first], stream):
+            chunk = ChatGenerationChunk(message=message_chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def _race(self, call, discard=None):
+        """
+        This function runs call(model) on the primary, hedges it with the next provider once the primary's p95
+        has passed and fails over on errors. It returns the first result and its model; discard(result) is
+        applied to the results of the losing calls that finish later.
+        """
+        candidates = self._candidates()
+        hedge_delay = max(
+            self.min_hedge_delay,
+            provider_health.latency_percentile(candidates[0].provider, 95, self.default_hedge_delay),
+        )
+        pending = {}
+        errors = []
+
+        def launch():
+            model = candidates.pop(0)
+            pending[_executor.submit(call, model)] = model
+
+        launch()
+        while pending:
+            done, _ = wait(pending, timeout=hedge_delay if candidates else None, return_when=FIRST_COMPLETED)
+            if not done:
+                # Still no answer after the primary's p95: hedge with the next provider
+                launch()
+                continue
+            for future in done:
+                model = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    if candidates:
+                        launch()
+                    continue
+                _cancel_losers(pending, discard)
+                return result, model
+        raise errors[-1]
+
+
+def _cancel_losers(pending, discard):
+    # Calls that have not started are cancelled; running ones finish in the background and are discarded
+    for future in pending:
+        if not future.cancel() and discard is not None:
+            future.add_done_callback(lambda f: f.exception() is None and discard(f.result()))
+
+
+def _timed_invoke(model, messages, stop, kwargs):
+    start = time.perf_counter()
+    try:
+        message = model.invoke(messages, config=_NO_CALLBACKS, stop=stop, **kwargs)
+    except Exception:
+        provider_health.record(model.provider, time.perf_counter() - start, ok=False)
+        raise
+    provider_health.record(model.provider, time.perf_counter() - start, ok=True)
+    return message
+
+
+def _open_stream(model, messages, stop, kwargs):
+    start = time.perf_counter()
+    try:
+        stream = iter(model.stream(messages, config=_NO_CALLBACKS, stop=stop, **kwargs))
+        first = next(stream, None)
+    except Exception:
+        provider_health.record(model.provider, time.perf_counter() - start, ok=False)
+        raise
+    provider_health.record(model.provider, time.perf_counter() - start, ok=True)
+    return first, stream
+
+
+def _close_stream(opened):
+    close = getattr(opened[1], "close", None)
+    if close is not None:
+        close()
@@ -0,0 +1,34 @@
+# response_metadata key naming the model that actually answered, set by the innermost wrapper
+# so the metrics of a hedged or routed call are attributed to the real model
+SERVED_MODEL_KEY = "served_model"
+
+
+def get_model_name(model):
+    """
+    This function returns the model name of a LangChain chat model (or of the model behind a tool binding).
+    """
+    # Models bound with tools are wrapped in a RunnableBinding
+    model = getattr(model, "bound", model)
+    return getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+
+
+def get_provider_name(model):
+    """
+    This function returns the provider of a wrapped chat model ("groq", "openai", ...), or "" if unknown.
+    """
+    model = getattr(model, "bound", model)
+    # A routed model reports the provider of its tiers, a failover model its primary provider
+    model = getattr(model, "small", model)
+    model = getattr(model, "bound", model)
+    models = getattr(model, "models", None)
+    if models:
+        model = models[0]
+    return getattr(model, "provider", "") or ""
+
+
+def mark_served_model(message, model_name):
+    """
+    This function records on a message (or the first chunk of a stream) which model produced it.
+    """
+    message.response_metadata.setdefault(SERVED_MODEL_KEY, model_name)
+    return message
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import Counter, deque
+
+from src.workflow.metrics.metrics import metrics
+
+# Rolling window of calls kept per model for the throughput estimate, in seconds
+STATS_WINDOW = 10 * 60
+MIN_SAMPLES = 5
+# Prompts above this many tokens always go to the long-context model
+SMALL_MODEL_MAX_TOKENS = 6000
+# Summarization prompts above this many tokens go to the long-context model
+LONG_PROMPT_TOKENS = 2000
+# A request the small model could take moves to the large one only if the small model is this much slower
+LATENCY_SLACK = 1.5
+# Assumed tokens per second (prompt plus completion) before enough calls have been observed
+DEFAULT_THROUGHPUT = {"small": 2000.0, "large": 800.0}
+# Routing decisions kept for inspection
+DECISION_LOG_SIZE = 200
+
+# Graph nodes whose LLM calls are news summarization
+SUMMARIZATION_NODES = {"summarize_ai_news", "summarize_frequency"}
+
+
+def classify_task(metadata, tools_bound):
+    """
+    This function returns the task type of an LLM call: "summarization", "tool_chat" or "chat".
+    """
+    if (metadata or {}).get("langgraph_node") in SUMMARIZATION_NODES:
+        return "summarization"
+    return "tool_chat" if tools_bound else "chat"
+
+
+class ModelRouter:
+    """
+    This class picks the small or the long-context model for each call from its estimated prompt size and task,
+    using the throughput observed per model, and keeps a log of its decisions.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._decisions = deque(maxlen=DECISION_LOG_SIZE)
+        self._counts = Counter()
+
+    def record(self, model_name, seconds, tokens):
+        """
+        This function records one successful call of a model and the tokens it processed.
+        """
+        now = time.time()
+        with self._lock:
+            calls = self._calls.setdefault(model_name, deque())
+            calls.append((now, seconds, tokens))
+            while calls and calls[0][0] < now - STATS_WINDOW:
+                calls.popleft()
+
+    def throughput(self, model_name, default):
+        """
+        This function returns the observed tokens per second of a model, or default without enough data.
+        """
+        with self._lock:
+            calls = list(self._calls.get(model_name, ()))
+        seconds = sum(call_seconds for _, call_seconds, _ in calls)
+        if len(calls) < MIN_SAMPLES or seconds <= 0:
+            return default
+        return sum(tokens for *_, tokens in calls) / seconds
+
+    def expected_latency(self, tier, model_name, tokens):
+        return tokens / self.throughput(model_name, DEFAULT_THROUGHPUT[tier])
+
+    def choose(self, task, tokens, small_name, large_name):
+        """
+        This function returns "small" or "large" for a call, and logs the decision with its reason.
+        """
+        expected = {
+            "small": self.expected_latency("small", small_name, tokens),
+            "large": self.expected_latency("large", large_name, tokens),
+        }
+        if tokens > SMALL_MODEL_MAX_TOKENS:
+            tier, reason = "large", "prompt exceeds the small model budget"
+        elif task == "summarization" and tokens >= LONG_PROMPT_TOKENS:
+            tier, reason = "large", "long summarization prompt"
+        elif expected["small"] > LATENCY_SLACK * expected["large"]:
+            tier, reason = "large", "small model currently slower"
+        else:
+            tier, reason = "small", "short prompt"
+
+        decision = {
+            "time": time.time(),
+            "task": task,
+            "tokens": tokens,
+            "tier": tier,
+            "model": small_name if tier == "small" else large_name,
+            "reason": reason,
+            "expected_s": round(expected[tier], 3),
+        }
+        with self._lock:
+            self._decisions.append(decision)
+            self._counts[(task, tier)] += 1
+        metrics.inc("ai_news_router_decisions_total", {"task": task, "tier": tier})
+        return tier
+
+    def decisions(self, limit=20):
+        """
+        This function returns the most recent routing decisions, newest first.
+        """
+        with self._lock:
+            return list(self._decisions)[-limit:][::-1]
+
+    def snapshot(self):
+        """
+        This function returns the decision counts per task and tier, and the observed throughput per model.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            models = list(self._calls)
+        return {
+            "decisions": {f"{task}/{tier}": count for (task, tier), count in sorted(counts.items())},
+            "throughput": {model_name: self.throughput(model_name, None) for model_name in models},
+        }
+
+
+model_router = ModelRouter()
@@ -1,6 +1,7 @@
-from langchain_openai import ChatOpenAI
+import logging
 import os
-import streamlit as st
+
+logger = logging.getLogger(__name__)
 
 class OpenAI:
     def __init__(self, user_selections):
@@ -10,15 +11,15 @@ class OpenAI:
         try:
             api_key = self.user_selections["llm_api_key"]
             if api_key == "" or os.environ.get("OPENAI_API_KEY") == "":
-                st.error("Please enter your API key")
-                return None
+                raise ValueError("Please enter your API key")
             model_name = self.user_selections["openai_model"]
             if model_name == "":
-                st.error("Please enter your model name")
-                return None
+                raise ValueError("Please enter your model name")
+            # Imported on first use so only the selected provider's SDK is loaded
+            from langchain_openai import ChatOpenAI
             model = ChatOpenAI(api_key=api_key, model_name=model_name)
-            st.success("OpenAI model loaded successfully")
+            logger.info("OpenAI model %s loaded successfully", model_name)
             return model
         except Exception as e:
-            st.error(f"Error loading OpenAI model: {e}")
-            raise ValueError(f"Error loading OpenAI model {e}")
\ No newline at end of file
+            logger.error("Error loading OpenAI model: %s", e)
+            raise ValueError(f"Error loading OpenAI model {e}")
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import deque
+
+# Rolling window of calls kept per provider, in seconds
+HEALTH_WINDOW = 5 * 60
+# The circuit opens after this many consecutive failures, or above this error rate over at least MIN_SAMPLES calls
+FAILURE_THRESHOLD = 5
+ERROR_RATE_THRESHOLD = 0.5
+MIN_SAMPLES = 10
+# How long an open circuit keeps the provider out; afterwards calls are let through again (half-open)
+# and the next failure re-opens it while a success closes it
+OPEN_COOLDOWN = 30.0
+
+
+class ProviderHealth:
+    """
+    This class tracks latency and errors per provider over a rolling window and runs a circuit breaker per provider.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._consecutive_failures = {}
+        self._open_until = {}
+
+    def record(self, provider, seconds, ok):
+        """
+        This function records one finished call.
+        """
+        now = time.time()
+        with self._lock:
+            calls = self._calls.setdefault(provider, deque())
+            calls.append((now, seconds, ok))
+            while calls and calls[0][0] < now - HEALTH_WINDOW:
+                calls.popleft()
+
+            if ok:
+                self._consecutive_failures[provider] = 0
+                self._open_until.pop(provider, None)
+                return
+
+            self._consecutive_failures[provider] = self._consecutive_failures.get(provider, 0) + 1
+            errors = sum(1 for _, _, call_ok in calls if not call_ok)
+            if (self._consecutive_failures[provider] >= FAILURE_THRESHOLD
+                    or (len(calls) >= MIN_SAMPLES and errors / len(calls) > ERROR_RATE_THRESHOLD)):
+                self._open_until[provider] = now + OPEN_COOLDOWN
+
+    def allow(self, provider):
+        """
+        This function tells whether a call may go to the provider (its circuit is not open).
+        """
+        with self._lock:
+            return time.time() >= self._open_until.get(provider, 0)
+
+    def latency_percentile(self, provider, pct, default):
+        """
+        This function returns a latency percentile of the provider's successful calls, or default without data.
+        """
+        with self._lock:
+            latencies = sorted(seconds for _, seconds, ok in self._calls.get(provider, ()) if ok)
+        if len(latencies) < 5:
+            return default
+        return latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))]
+
+    def snapshot(self):
+        """
+        This function returns per-provider call counts, error rate, p50/p95 latency and circuit state.
+        """
+        with self._lock:
+            providers = list(self._calls)
+            now = time.time()
+            states = {p: ("open" if self._open_until.get(p, 0) > now else "half-open" if p in self._open_until else "closed") for p in providers}
+            calls = {p: list(self._calls[p]) for p in providers}
+        return {
+            provider: {
+                "calls": len(calls[provider]),
+                "error_rate": round(sum(1 for *_, ok in calls[provider] if not ok) / len(calls[provider]), 3) if calls[provider] else 0.0,
+                "p50_s": self.latency_percentile(provider, 50, None),
+                "p95_s": self.latency_percentile(provider, 95, None),
+                "circuit": states[provider],
+            }
+            for provider in providers
+        }
+
+
+provider_health = ProviderHealth()
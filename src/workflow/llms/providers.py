@@ -0,0 +1,90 @@
+# Provider wrappers are referenced by import path so a process only loads the SDK it uses
+LLM_PROVIDERS = {
+    "Groq": {"wrapper": "src.workflow.llms.groq:Groq", "model_field": "groq_model", "api_key_env": "GROQ_API_KEY"},
+    "OpenAI": {"wrapper": "src.workflow.llms.openai:OpenAI", "model_field": "openai_model", "api_key_env": "OPENAI_API_KEY"},
+    "Gemini": {"wrapper": "src.workflow.llms.gemini:Gemini", "model_field": "gemini_model", "api_key_env": "GOOGLE_API_KEY"},
+}
+
+
+def build_chat_model(user_selections):
+    """
+    This function creates the selected provider's chat model, routed through the shared outbound client.
+    """
+    from src.workflow.llms.resilient_model import ResilientChatModel
+    from src.workflow.utils.imports import load_object
+
+    provider_name = user_selections["llm_model"]
+    model = load_object(LLM_PROVIDERS[provider_name]["wrapper"])(user_selections=user_selections).get_model()
+    if model is None:
+        return None
+    return ResilientChatModel.wrap(model, provider_name, user_selections.get("llm_api_key"))
+
+
+def failover_api_keys(user_selections, failover_models):
+    """
+    This function returns the API keys of the failover providers other than the selected one, as {provider: key}.
+    A key comes from the session's own failover keys (user_selections["failover_api_keys"]) or from the server-side
+    FAILOVER_<API key variable> environment variable, never from the provider keys sessions write to the environment.
+    """
+    import os
+
+    session_keys = user_selections.get("failover_api_keys") or {}
+    api_keys = {}
+    for provider_name in failover_models:
+        if provider_name == user_selections["llm_model"] or provider_name not in LLM_PROVIDERS:
+            continue
+        api_key = session_keys.get(provider_name) or os.environ.get("FAILOVER_" + LLM_PROVIDERS[provider_name]["api_key_env"], "")
+        if api_key:
+            api_keys[provider_name] = api_key
+    return api_keys
+
+
+def build_failover_chat_model(user_selections, failover_models):
+    """
+    This function creates a chat model that hedges slow calls and fails over from the selected provider
+    to the other providers in failover_models ({provider: model name}) that have a key from failover_api_keys.
+    """
+    import logging
+    from src.workflow.llms.hedged_model import HedgedChatModel
+
+    primary = build_chat_model(user_selections)
+    if primary is None:
+        return None
+
+    models = [primary]
+    for provider_name, api_key in failover_api_keys(user_selections, failover_models).items():
+        provider = LLM_PROVIDERS[provider_name]
+        try:
+            model = build_chat_model({
+                "llm_model": provider_name, "llm_api_key": api_key, provider["model_field"]: failover_models[provider_name],
+            })
+        except ValueError as e:
+            logging.getLogger(__name__).warning("Skipping failover provider %s: %s", provider_name, e)
+            continue
+        if model is not None:
+            models.append(model)
+    return HedgedChatModel.wrap(models) if len(models) > 1 else primary
+
+
+def build_routed_chat_model(user_selections, router_models, failover_models=None):
+    """
+    This function creates a chat model that routes each call to the small model of the selected provider,
+    from router_models ({provider: small model}), or to the model selected in the sidebar. With failover_models,
+    each tier also fails over to the other providers.
+    """
+    provider_name = user_selections["llm_model"]
+    if provider_name not in router_models:
+        raise ValueError(f"No routing models configured for {provider_name}")
+    from src.workflow.llms.routed_model import RoutedChatModel
+
+    model_field = LLM_PROVIDERS[provider_name]["model_field"]
+    tiers = []
+    for model_name in (router_models[provider_name], user_selections.get(model_field, "")):
+        selections = dict(user_selections, **{model_field: model_name})
+        if failover_models:
+            tiers.append(build_failover_chat_model(selections, failover_models))
+        else:
+            tiers.append(build_chat_model(selections))
+    if None in tiers:
+        return None
+    return RoutedChatModel.wrap(*tiers)
@@ -0,0 +1,70 @@
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from src.workflow.cache.resource_pool import hash_secret
+from src.workflow.cache.ttl_cache import make_cache_key
+from src.workflow.llms.model_info import get_model_name, mark_served_model
+from src.workflow.outbound.outbound_client import get_outbound_client
+
+# The inner model runs without callbacks; this wrapper reports the call (and its streamed tokens) once
+_NO_CALLBACKS = {"callbacks": []}
+
+
+class ResilientChatModel(BaseChatModel):
+    """
+    This class routes every call of a provider chat model through the shared outbound client
+    (single-flight, rate limit, concurrency cap, retry with backoff). It works with bind_tools and streaming.
+    """
+    runnable: Any
+    provider: str
+    account: str = ""
+    model_name: str = ""
+
+    @classmethod
+    def wrap(cls, model, provider, api_key=None):
+        """
+        This function wraps a provider chat model; provider selects the outbound policy ("groq", "openai", ...)
+        and api_key the account whose rate limit and call slots the model's calls use.
+        """
+        return cls(runnable=model, provider=provider.lower(), account=hash_secret(api_key), model_name=get_model_name(model))
+
+    @property
+    def _llm_type(self):
+        return f"resilient-{self.provider}"
+
+    def _get_ls_params(self, stop=None, **kwargs):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_provider"] = self.provider
+        params["ls_model_name"] = self.model_name
+        return params
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"runnable": self.runnable.bind_tools(tools, **kwargs)})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Identical requests to the same (tool-bound) model that are already in flight share one call
+        message = get_outbound_client(self.provider, self.account).call(
+            lambda: self.runnable.invoke(messages, config=_NO_CALLBACKS, stop=stop, **kwargs), key=self._call_key(messages, stop)
+        )
+        return ChatResult(generations=[ChatGeneration(message=mark_served_model(message, self.model_name))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        # Identical streams in flight share one call; retries cover opening the stream, up to the first chunk,
+        # and a stream that breaks later is not replayed
+        stream = get_outbound_client(self.provider, self.account).stream(
+            lambda: self.runnable.stream(messages, config=_NO_CALLBACKS, stop=stop, **kwargs), key=self._call_key(messages, stop)
+        )
+        for index, message_chunk in enumerate(stream):
+            if index == 0:
+                mark_served_model(message_chunk, self.model_name)
+            chunk = ChatGenerationChunk(message=message_chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def _call_key(self, messages, stop):
+        return make_cache_key(
+            self.account, id(self.runnable), stop,
+            [(message.type, message.content, getattr(message, "tool_calls", None)) for message in messages],
+        )
@@ -0,0 +1,71 @@
+import time
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from src.workflow.llms.model_info import get_model_name, get_provider_name
+from src.workflow.llms.model_router import classify_task, model_router
+from src.workflow.utils.text import estimate_tokens
+
+# The tier models run without callbacks; this wrapper reports the call once
+_NO_CALLBACKS = {"callbacks": []}
+
+
+def _estimate_prompt_tokens(messages):
+    return sum(estimate_tokens(str(message.content)) for message in messages)
+
+
+class RoutedChatModel(BaseChatModel):
+    """
+    This class sends each call to a small, fast model or to the model selected in the sidebar,
+    as chosen by the model router from the estimated prompt size and the task (chat, tool-using chat, summarization).
+    """
+    small: Any
+    large: Any
+    model_name: str = ""
+    tools_bound: bool = False
+
+    @classmethod
+    def wrap(cls, small, large):
+        return cls(small=small, large=large, model_name=f"{get_model_name(small)}|{get_model_name(large)}")
+
+    @property
+    def _llm_type(self):
+        return "routed"
+
+    def _get_ls_params(self, stop=None, **kwargs):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_provider"] = get_provider_name(self.small)
+        params["ls_model_name"] = self.model_name
+        return params
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={
+            "small": self.small.bind_tools(tools, **kwargs),
+            "large": self.large.bind_tools(tools, **kwargs),
+            "tools_bound": True,
+        })
+
+    def _route(self, messages, run_manager):
+        tokens = _estimate_prompt_tokens(messages)
+        task = classify_task(run_manager.metadata if run_manager else None, self.tools_bound)
+        tier = model_router.choose(task, tokens, get_model_name(self.small), get_model_name(self.large))
+        return (self.small if tier == "small" else self.large), tokens
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        model, tokens = self._route(messages, run_manager)
+        start = time.perf_counter()
+        message = model.invoke(messages, config=_NO_CALLBACKS, stop=stop, **kwargs)
+        model_router.record(get_model_name(model), time.perf_counter() - start, tokens + estimate_tokens(str(message.content)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        model, tokens = self._route(messages, run_manager)
+        start = time.perf_counter()
+        for message_chunk in model.stream(messages, config=_NO_CALLBACKS, stop=stop, **kwargs):
+            tokens += estimate_tokens(str(message_chunk.content))
+            chunk = ChatGenerationChunk(message=message_chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        model_router.record(get_model_name(model), time.perf_counter() - start, tokens)
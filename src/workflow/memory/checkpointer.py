@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import threading
+
+from langgraph.checkpoint.memory import MemorySaver
+from src.workflow.paths import data_path
+
+# "sqlite" (default) keeps threads on disk across restarts; "memory" keeps them for the life of the process
+CHECKPOINTER_KIND = os.environ.get("AI_NEWS_CHECKPOINTER", "sqlite")
+
+_checkpointer = None
+_checkpointer_lock = threading.Lock()
+
+
+def get_checkpointer():
+    """
+    This function returns the process-wide LangGraph checkpointer shared by every compiled graph.
+    """
+    global _checkpointer
+    with _checkpointer_lock:
+        if _checkpointer is None:
+            _checkpointer = _create_checkpointer(CHECKPOINTER_KIND)
+        return _checkpointer
+
+
+def _create_checkpointer(kind):
+    if kind == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError:
+            # langgraph-checkpoint-sqlite is not installed; threads then live in memory only
+            return MemorySaver()
+        conn = sqlite3.connect(data_path("checkpoints.sqlite"), check_same_thread=False)
+        return SqliteSaver(conn)
+    return MemorySaver()
+
+
+def thread_config(thread_id):
+    """
+    This function returns the run config that selects a checkpointed thread.
+    """
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def load_thread_messages(thread_id):
+    """
+    This function returns the messages stored for a thread, or an empty list for a new thread.
+    """
+    checkpoint_tuple = get_checkpointer().get_tuple(thread_config(thread_id))
+    if checkpoint_tuple is None:
+        return []
+    return checkpoint_tuple.checkpoint.get("channel_values", {}).get("messages", [])
+
+
+def clear_thread(thread_id):
+    """
+    This function deletes a thread's checkpoints, so its next run starts from an empty history.
+    """
+    checkpointer = get_checkpointer()
+    # delete_thread is only available in recent checkpointer versions
+    if hasattr(checkpointer, "delete_thread"):
+        checkpointer.delete_thread(thread_id)
@@ -0,0 +1,104 @@
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage, ToolMessage
+from langgraph.constants import TAG_NOSTREAM
+from src.workflow.utils.text import estimate_tokens, truncate_to_tokens
+
+FOLD_PROMPT = """
+You maintain a running summary of a conversation between a user and an AI assistant.
+Update the summary below with the new conversation turns. Keep facts, names, decisions and open questions.
+Keep it under {max_words} words and reply with the updated summary only.
+
+Current summary:
+{summary}
+
+New conversation turns:
+{turns}
+"""
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens(kind, content):
+    # Counts only depend on the message text, so they are computed once per distinct message
+    return estimate_tokens(content) + 4
+
+
+def count_message_tokens(message):
+    """
+    This function returns the (cached) token count of a chat message.
+    """
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return _count_tokens(message.type, content)
+
+
+class ContextWindow:
+    """
+    This class keeps the messages sent to the model under a token budget.
+    Recent messages are kept verbatim; older ones are folded into a running summary.
+    """
+    def __init__(self, model, token_budget=3000, summary_token_budget=400):
+        self.model = model
+        self.token_budget = token_budget
+        self.summary_token_budget = summary_token_budget
+
+    def build(self, messages, summary_state=None):
+        """
+        This function returns the messages for the model and the updated summary state.
+        summary_state is {"summary": str, "folded": int}, where folded counts the leading messages already summarized.
+        """
+        summary_state = dict(summary_state or {"summary": "", "folded": 0})
+        if summary_state["folded"] > len(messages):
+            # The history was cleared since the summary was written
+            summary_state = {"summary": "", "folded": 0}
+
+        live = messages[summary_state["folded"]:]
+        budget = self.token_budget - (self.summary_token_budget if summary_state["summary"] else 0)
+
+        # Walk back from the newest message until the budget is spent (the newest is always kept)
+        start = len(live)
+        used = 0
+        while start > 0:
+            tokens = count_message_tokens(live[start - 1])
+            if used + tokens > budget and start < len(live):
+                break
+            used += tokens
+            start -= 1
+
+        # Never open the window on a tool output whose tool call was cut off
+        while start < len(live) - 1 and isinstance(live[start], ToolMessage):
+            start += 1
+
+        evicted = live[:start]
+        if evicted:
+            summary_state["summary"] = self._fold(summary_state["summary"], evicted)
+            summary_state["folded"] += len(evicted)
+
+        window = live[start:]
+        if summary_state["summary"]:
+            window = [SystemMessage(content=f"Summary of the earlier conversation:\n{summary_state['summary']}")] + window
+        return window, summary_state
+
+    def _fold(self, summary, evicted):
+        """
+        This function folds the evicted messages into the running summary with one model call.
+        """
+        turns = "\n".join(
+            f"{message.type}: {truncate_to_tokens(str(message.content), self.summary_token_budget)}"
+            for message in evicted if message.content
+        )
+        if not turns:
+            return summary
+        try:
+            # The fold runs inside the chatbot node; it is kept out of the streamed reply tokens
+            response = self.model.invoke(
+                FOLD_PROMPT.format(
+                    max_words=int(self.summary_token_budget * 0.75),
+                    summary=summary or "(empty)",
+                    turns=turns,
+                ),
+                config={"tags": [TAG_NOSTREAM]},
+            )
+            return response.content
+        except Exception:
+            # Keep the previous summary rather than failing the user's turn
+            return summary
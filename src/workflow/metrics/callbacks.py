@@ -0,0 +1,126 @@
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+from src.workflow.llms.model_info import SERVED_MODEL_KEY
+from src.workflow.metrics.metrics import estimate_cost, metrics
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    This class records wall time, tokens, cost and errors for every graph node, LLM call and tool call of a run.
+    Pass a new instance in the run config; its trace holds the events of that run for the UI.
+    """
+    def __init__(self, use_case=""):
+        self.use_case = use_case
+        self.trace = []
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    # Graph nodes
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Only the node's own run, not the runnables nested inside it
+        if node and kwargs.get("name") == node:
+            self._start(run_id, "node", node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    # LLM calls
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, "llm", (metadata or {}).get("ls_model_name") or "unknown")
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, "llm", (metadata or {}).get("ls_model_name") or "unknown")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        prompt_tokens, completion_tokens = _token_usage(response)
+        self._finish(run_id, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, name=_served_model(response))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    # Tool calls
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._start(run_id, "tool", (serialized or {}).get("name") or kwargs.get("name") or "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    def _start(self, run_id, kind, name):
+        with self._lock:
+            self._runs[run_id] = (kind, name, time.perf_counter())
+
+    def _finish(self, run_id, error=None, prompt_tokens=0, completion_tokens=0, name=None):
+        with self._lock:
+            started = self._runs.pop(run_id, None)
+        if started is None:
+            return
+        kind, started_name, start = started
+        # A hedged or routed call is reported under the model that answered, not the wrapper
+        name = name or started_name
+        seconds = time.perf_counter() - start
+        label = {"node": "node", "llm": "model", "tool": "tool"}[kind]
+        labels = {label: name}
+
+        metrics.observe(f"ai_news_{kind}_duration_seconds", labels, seconds)
+        if error is not None:
+            metrics.inc(f"ai_news_{kind}_errors_total", labels)
+
+        cost = 0.0
+        if kind == "llm":
+            cost = estimate_cost(name, prompt_tokens, completion_tokens)
+            metrics.inc("ai_news_llm_tokens_total", {"model": name, "kind": "prompt"}, prompt_tokens)
+            metrics.inc("ai_news_llm_tokens_total", {"model": name, "kind": "completion"}, completion_tokens)
+            metrics.inc("ai_news_llm_cost_usd_total", {"model": name}, cost)
+
+        event = {
+            "event": kind,
+            "name": name,
+            "use_case": self.use_case,
+            "seconds": round(seconds, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": round(cost, 6),
+            "error": repr(error) if error is not None else None,
+        }
+        metrics.emit(event)
+        with self._lock:
+            self.trace.append(event)
+
+
+def _token_usage(response):
+    """
+    This function reads prompt and completion token counts from an LLMResult.
+    """
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+    if not prompt_tokens and not completion_tokens:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+
+def _served_model(response):
+    """
+    This function returns the model that produced an LLMResult, as marked by the model wrappers, or None.
+    """
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "response_metadata", None) or {}
+            if metadata.get(SERVED_MODEL_KEY):
+                return metadata[SERVED_MODEL_KEY]
+    return None
@@ -0,0 +1,190 @@
+import json
+import logging
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram buckets, in seconds
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Approximate USD price per 1M (input, output) tokens, keyed by lower-case model name
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4": (30.00, 60.00),
+    "gpt-4-mini": (0.15, 0.60),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "meta-llama/llama-guard-4-12b": (0.20, 0.20),
+    "openai/gpt-oss-20b": (0.10, 0.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-exp": (0.10, 0.40),
+}
+
+METRIC_HELP = {
+    "ai_news_node_duration_seconds": ("histogram", "Wall time of graph node runs"),
+    "ai_news_node_errors_total": ("counter", "Graph node runs that raised"),
+    "ai_news_llm_duration_seconds": ("histogram", "Wall time of LLM calls"),
+    "ai_news_llm_tokens_total": ("counter", "LLM tokens by kind (prompt/completion)"),
+    "ai_news_llm_cost_usd_total": ("counter", "Estimated LLM cost in USD"),
+    "ai_news_llm_errors_total": ("counter", "LLM calls that raised"),
+    "ai_news_tool_duration_seconds": ("histogram", "Wall time of tool calls"),
+    "ai_news_tool_errors_total": ("counter", "Tool calls that raised"),
+    "ai_news_cache_requests_total": ("counter", "Cache lookups by result (hit/miss)"),
+    "ai_news_article_tokens_total": ("counter", "Estimated article tokens before and after extractive compression"),
+    "ai_news_router_decisions_total": ("counter", "Model router decisions by task and tier (small/large)"),
+}
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """
+    This function estimates the USD cost of an LLM call from the price table (0.0 for unknown models).
+    """
+    name = (model or "").lower()
+    if name.startswith("openai-"):
+        name = name[len("openai-"):]
+    input_price, output_price = MODEL_PRICES.get(name, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+class MetricsRegistry:
+    """
+    This class holds the process-wide counters and histograms and renders them for export.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+
+    def inc(self, name, labels, amount=1.0):
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += amount
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.setdefault(key, {"buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def emit(self, event):
+        """
+        This function writes one structured event as a JSON log line.
+        """
+        logger.info(json.dumps(event, default=str))
+
+    def to_prometheus(self):
+        """
+        This function renders every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: dict(value, buckets=list(value["buckets"])) for key, value in self._histograms.items()}
+
+        lines = []
+        for metric, (kind, help_text) in METRIC_HELP.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            if kind == "counter":
+                for (name, labels), value in sorted(counters.items()):
+                    if name == metric:
+                        lines.append(f"{metric}{_labels(labels)} {value}")
+            else:
+                for (name, labels), histogram in sorted(histograms.items()):
+                    if name != metric:
+                        continue
+                    for bound, count in zip(DURATION_BUCKETS, histogram["buckets"]):
+                        lines.append(f"{metric}_bucket{_labels(labels + (('le', str(bound)),))} {count}")
+                    lines.append(f"{metric}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+                    lines.append(f"{metric}_sum{_labels(labels)} {histogram['sum']}")
+                    lines.append(f"{metric}_count{_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        """
+        This function returns every metric as a JSON-serializable dict.
+        """
+        with self._lock:
+            return {
+                "counters": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in self._counters.items()],
+                "histograms": [{"name": name, "labels": dict(labels), **value} for (name, labels), value in self._histograms.items()],
+            }
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        f'{key}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ") + '"'
+        for key, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+metrics = MetricsRegistry()
+
+
+def record_cache_lookup(cache, hit):
+    """
+    This function counts one cache lookup.
+    """
+    metrics.inc("ai_news_cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"})
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = json.dumps(metrics.to_json()), "application/json"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def configure_event_logging(stream=None):
+    """
+    This function prints the structured metric events as one JSON object per line (to stderr by default).
+    The Streamlit app configures no logging of its own, so without it the events would be dropped.
+    """
+    if any(getattr(handler, "_metrics_events", False) for handler in logger.handlers):
+        return
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler._metrics_events = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # Events are printed once here, not again by a root handler
+    logger.propagate = False
+
+
+def start_metrics_server(port, host="0.0.0.0"):
+    """
+    This function serves /metrics (Prometheus) and /metrics.json on a daemon thread, once per process.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            configure_event_logging()
+            _server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
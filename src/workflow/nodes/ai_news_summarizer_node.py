@@ -1,101 +1,409 @@
-from tavily import TavilyClient
 from langchain_core.prompts import ChatPromptTemplate
-import os
+from langgraph.types import Send
+from src.workflow.cache.ttl_cache import get_ttl_cache, make_cache_key
+from src.workflow.cache.lru_cache import get_lru_cache
+from src.workflow.llms.model_info import get_model_name, get_provider_name
+from src.workflow.store.digest_store import get_digest_store
+from src.workflow.tools.tools import get_tavily_client, tavily_account
+from src.workflow.outbound.outbound_client import get_outbound_client
+from src.workflow.metrics.metrics import metrics, record_cache_lookup
+from src.workflow.utils.text import estimate_tokens, truncate_to_tokens
+from src.workflow.utils.extractive import compress_text
+from src.workflow.utils.dedup import canonicalize_url, dedupe_articles
+from src.workflow.utils.dates import parse_published_date
+from concurrent.futures import ThreadPoolExecutor
+import re
+import time
+
+SUMMARY_SYSTEM_PROMPT = """
+        You are an expert AI news summarizer. Your task is to summarize the latest AI news from the web and provide in markdown format.
+        For each item include:
+        - Date in dd-mm-yyyy format
+        - Title in bold
+        - Concise summary of the news
+        - URL in markdown format
+
+        Output Format:
+        #### [Date] 
+        **[Title]**
+        - [Summary](URL)
+        """
+
+ARTICLE_SYSTEM_PROMPT = """
+        You are an expert AI news analyst. Summarize the given news article in at most three sentences.
+        Keep names, numbers and dates. Reply with the summary only.
+        """
+
+# Metadata flag set on the model call whose tokens make up the digest shown to the user
+DIGEST_STREAM_TAG = "ai_news_digest"
+
+# One "- [Summary](URL)" item of a digest, as asked for by SUMMARY_SYSTEM_PROMPT
+DIGEST_ITEM_PATTERN = re.compile(r"\[([^\]]+)\]\((\S+?)\)")
+
+# Digest returned when a window has no articles
+NO_NEWS_SUMMARY = "No news articles found for this period."
+
+# Sub-queries fanned out for every fetch, keyed by the area of AI news they cover
+NEWS_QUERIES = {
+    "general": "latest AI news",
+    "research": "latest AI research breakthroughs",
+    "products": "latest AI product launches",
+    "policy": "latest AI policy and regulation news",
+    "funding": "latest AI startup funding news",
+}
+
+# Tavily time range and window length, in days, per frequency
+TIME_RANGES = {"daily": "d", "weekly": "w", "monthly": "m", "yearly": "y"}
+WINDOW_DAYS = {"daily": 1, "weekly": 7, "monthly": 30, "yearly": 365}
+
+# Frequencies summarized together by the multi-frequency graph, narrowest window first
+MULTI_FREQUENCIES = ("daily", "weekly", "monthly")
+
+# How long a Tavily search result stays fresh, in seconds, per frequency
+SEARCH_CACHE_TTL = {"daily": 15 * 60, "weekly": 60 * 60, "monthly": 6 * 60 * 60, "yearly": 24 * 60 * 60}
+
+# Stuffed article text above this share of the most the articles may take (max_results * article_token_budget)
+# is map-reduced instead of sent in one call
+STUFF_BUDGET_SHARE = 0.75
+
 
 class AINewsSummarizerNode:
-    def __init__(self, model):
+    def __init__(self, model, summary_mode="stuff", article_token_budget=400, max_concurrency=5,
+                 queries=None, results_per_query=5, max_results=10, tavily_client=None, store=None,
+                 stuff_token_budget=None):
+        """
+        summary_mode is "stuff" (a single call, switching to map-reduce only when the articles exceed
+        stuff_token_budget tokens) or "map_reduce" (always one call per article, then one combining call).
+        stuff_token_budget defaults to STUFF_BUDGET_SHARE of max_results * article_token_budget.
+        article_token_budget caps how much of each article, after extractive compression, reaches the model.
+        max_concurrency bounds the number of parallel map calls.
+        queries maps a name to each search sub-query (defaults to NEWS_QUERIES).
+        results_per_query and max_results bound each search and the deduplicated article set.
+        tavily_client replaces the shared Tavily client (e.g. with a local stand-in for benchmarks).
+        store replaces the shared digest store the results are saved to.
+        """
         self.model = model
-        self.tavily = TavilyClient()
+        self.queries = queries or NEWS_QUERIES
+        self.results_per_query = results_per_query
+        self.max_results = max_results
+        self.summary_mode = summary_mode
+        self.stuff_token_budget = stuff_token_budget or int(STUFF_BUDGET_SHARE * max_results * article_token_budget)
+        self.article_token_budget = article_token_budget
+        self.max_concurrency = max_concurrency
+        self.tavily = tavily_client or get_tavily_client()
+        self.search_cache = get_ttl_cache("tavily_news")
+        self.summary_cache = get_lru_cache("news_summaries")
+        self.store = store or get_digest_store()
         self.state = {}
 
     def fetch_ai_news(self, state: dict) -> dict:
         """
         This function fetches the latest AI news from the web.
         """
-        # Get the frequency from the last message
+        frequency = self._requested_frequency(state)
+        news_data = self._fetch(frequency, self.results_per_query)[:self.max_results]
+
+        return {
+            "news_data": news_data,
+            "frequency": frequency
+        }
+
+    def fetch_all_frequencies(self, state: dict) -> dict:
+        """
+        This function fetches the news once for the widest window and partitions it by published date into
+        the daily, weekly and monthly article sets (each window contains the shorter ones).
+        """
+        # Ask for more results per query, since one search now has to cover all three windows
+        results_per_query = min(20, self.results_per_query * len(MULTI_FREQUENCIES))
+        news_data = self._fetch(MULTI_FREQUENCIES[-1], results_per_query)
+
+        now = time.time()
+        news_by_frequency = {frequency: [] for frequency in MULTI_FREQUENCIES}
+        kept = {}
+        for news in news_data:
+            published_at = parse_published_date(news.get("published_date"))
+            for frequency in MULTI_FREQUENCIES:
+                # Articles without a usable date only count for the widest window
+                in_window = (
+                    now - published_at <= WINDOW_DAYS[frequency] * 24 * 60 * 60 if published_at is not None
+                    else frequency == MULTI_FREQUENCIES[-1]
+                )
+                if in_window and len(news_by_frequency[frequency]) < self.max_results:
+                    news_by_frequency[frequency].append(news.get("url", ""))
+                    kept[news.get("url", "")] = news
+
+        # Windows hold URLs, so they still resolve to the articles compress_articles returns
+        return {
+            "news_data": list(kept.values()),
+            "news_by_frequency": news_by_frequency,
+            "frequency": self._requested_frequency(state),
+        }
+
+    def route_frequencies(self, state: dict) -> list:
+        """
+        This function fans out one summarization branch per frequency.
+        """
+        articles = {news.get("url", ""): news for news in state.get("news_data", [])}
+        return [
+            Send("summarize_frequency", {
+                "frequency": frequency,
+                "requested_frequency": state.get("frequency"),
+                "news_data": [articles[url] for url in urls if url in articles],
+            })
+            for frequency, urls in state.get("news_by_frequency", {}).items()
+        ]
+
+    @staticmethod
+    def _requested_frequency(state):
+        """
+        This function reads the requested frequency from the last message, defaulting to daily.
+        """
         frequency = state["messages"][-1].content.lower()
         if frequency.startswith("fetching "):
             # Extract 'daily', 'weekly', etc. from 'Fetching Daily Latest AI News'
             parts = frequency.split(" ")
             if len(parts) > 1:
                 frequency = parts[1].lower()
-            
-        time_range_map = {"daily": "d", "weekly": "w", "monthly": "m", "yearly": "y"}
-        days_map = {"daily": 1, "weekly": 7, "monthly": 30, "yearly": 365}
-        
-        # Default to daily if not matched
-        if frequency not in time_range_map:
-            frequency = "daily"
-
-        # Hit the tavily api
-        response = self.tavily.search(
-            query="latest AI news", 
-            topic="news",
-            time_range=time_range_map[frequency], 
-            include_answer="advanced",
-            max_results=10,
-            days=days_map[frequency]
-        )
-        
-        return {
-            "news_data": response.get('results', []),
-            "frequency": frequency
+        return frequency if frequency in TIME_RANGES else "daily"
+
+    def _fetch(self, frequency, results_per_query):
+        """
+        This function fans out the sub-queries concurrently, then merges, dedupes and ranks the results.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.queries)) as executor:
+            responses = list(executor.map(
+                lambda query: self._search(query, frequency, results_per_query),
+                self.queries.values(),
+            ))
+        results = [news for response in responses for news in response.get("results", [])]
+        return dedupe_articles(results)
+
+    def _search(self, query, frequency, results_per_query):
+        """
+        This function runs one Tavily news search, served from the shared cache while it is fresh.
+        """
+        search_params = {
+            "query": query,
+            "time_range": TIME_RANGES[frequency],
+            "days": WINDOW_DAYS[frequency],
+            "max_results": results_per_query,
         }
 
+        cache_key = make_cache_key(**search_params)
+        response = self.search_cache.get(cache_key)
+        if response is None:
+            # Hit the tavily api (the generated answer is never used, so it is not requested);
+            # concurrent sessions asking for the same search share one request
+            response = get_outbound_client("tavily", tavily_account()).call(
+                lambda: self.tavily.search(topic="news", **search_params), key=cache_key
+            )
+            self.search_cache.set(cache_key, response, SEARCH_CACHE_TTL[frequency])
+        return response
+
+    def compress_articles(self, state: dict) -> dict:
+        """
+        This function strips boilerplate from the articles and keeps their top-ranked sentences within the token budget.
+        The result goes to compressed_content; content keeps the raw article for the store and the summary keys.
+        """
+        news_data = state.get("news_data", [])
+        compressed = [
+            dict(news, compressed_content=compress_text(news.get("content", ""), self.article_token_budget))
+            for news in news_data
+        ]
+
+        tokens_in = sum(estimate_tokens(news.get("content", "")) for news in news_data)
+        tokens_out = sum(estimate_tokens(news["compressed_content"]) for news in compressed)
+        metrics.inc("ai_news_article_tokens_total", {"stage": "raw"}, tokens_in)
+        metrics.inc("ai_news_article_tokens_total", {"stage": "compressed"}, tokens_out)
+        compression_ratio = tokens_out / tokens_in if tokens_in else 1.0
+        metrics.emit({
+            "event": "compression", "articles": len(news_data), "tokens_in": tokens_in,
+            "tokens_out": tokens_out, "ratio": round(compression_ratio, 3),
+        })
+        return {"news_data": compressed, "compression_ratio": compression_ratio}
+
     def summarize_ai_news(self, state: dict) -> dict:
         """
         This function summarizes the latest AI news.
         """
-        system_prompt = """
-        You are an expert AI news summarizer. Your task is to summarize the latest AI news from the web and provide in markdown format.
-        For each item include:
-        - Date in dd-mm-yyyy format
-        - Title in bold
-        - Concise summary of the news
-        - URL in markdown format
+        return {"summary": self._summarize(state.get("news_data", []))}
 
-        Output Format:
-        #### [Date] 
-        **[Title]**
-        - [Summary](URL)
+    def summarize_frequency(self, state: dict) -> dict:
+        """
+        This function summarizes the articles of one frequency, as one parallel branch of the multi-frequency graph.
+        Only the requested frequency's digest is tagged for streaming, so the UI shows a single digest.
+        """
+        frequency = state["frequency"]
+        summary = self._summarize(state["news_data"], stream=frequency == state["requested_frequency"])
+        return {"summaries": {frequency: summary}}
+
+    def _summarize(self, news_data, stream=True):
+        """
+        This function turns a set of articles into the dated markdown digest.
         """
         prompt_template = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
+            ("system", SUMMARY_SYSTEM_PROMPT),
             ("user", "Summarize the below latest AI news from the web: \n{articles}")
         ])
 
-        # Get news data from state
-        news_data = state.get("news_data", [])
         if not news_data:
-            return {"summary": "No news articles found for this period."}
+            return NO_NEWS_SUMMARY
+
+        # Articles summarized by an earlier run (same URL and content, same model) are sent as their stored
+        # summary, so only new or changed articles reach the model in full
+        keys = [self._article_key(news) for news in news_data]
+        stored = self.store.get_article_summaries(keys, self._summarizer())
+        contents = [stored.get(key) or _article_text(news) for news, key in zip(news_data, keys)]
+
+        # One call per digest unless the articles would not fit the stuffed prompt budget
+        summary_mode = self.summary_mode
+        if summary_mode == "stuff" and sum(estimate_tokens(content) for content in contents) > self.stuff_token_budget:
+            summary_mode = "map_reduce"
+
+        # Identical article sets summarized by the same model and prompt skip the LLM
+        cache_key = make_cache_key(
+            articles=self._normalize_articles(news_data),
+            model=get_model_name(self.model),
+            system_prompt=SUMMARY_SYSTEM_PROMPT,
+            summary_mode=summary_mode,
+            article_token_budget=self.article_token_budget,
+        )
+        summary = self.summary_cache.get(cache_key)
+        if summary is not None:
+            return summary
+
+        for key in keys:
+            record_cache_lookup("article_summaries", key in stored)
+        if summary_mode == "map_reduce":
+            # Map: condense every new or changed article on its own, concurrently
+            article_summaries = self._map_articles(news_data, keys, stored)
+        else:
+            article_summaries = contents
 
         new_content = "\n\n".join(
-            f"content: {news.get('content', '')}\nurl: {news.get('url', '')}\ndate: {news.get('published_date', '')}\ntitle: {news.get('title', '')}" 
-            for news in news_data
+            f"content: {content}\nurl: {news.get('url', '')}\ndate: {news.get('published_date', '')}\ntitle: {news.get('title', '')}"
+            for news, content in zip(news_data, article_summaries)
+        )
+
+        # Reduce: one call assembles the dated markdown digest (tagged so the UI can stream its tokens)
+        response = self.model.invoke(
+            prompt_template.format(articles=new_content), config={"metadata": {DIGEST_STREAM_TAG: stream}}
         )
+        if summary_mode == "stuff":
+            # The digest items of the new or changed articles are stored as their summaries for later runs
+            items = _digest_items(response.content)
+            self.store.save_article_summaries(
+                [key + (items[key[0]],) for key in keys if key not in stored and key[0] in items], self._summarizer()
+            )
+        self.summary_cache.set(cache_key, response.content)
+        return response.content
+
+    def _summarizer(self):
+        """
+        This function identifies the model and budget the stored per-article summaries were made with.
+        """
+        return make_cache_key(get_model_name(self.model), ARTICLE_SYSTEM_PROMPT, self.article_token_budget)
+
+    def _map_articles(self, news_data, keys, stored):
+        """
+        This function summarizes each article separately through a bounded pool of model calls.
+        keys are the articles' _article_key values and stored their summaries from earlier runs,
+        which are reused, so only new or changed articles reach the model.
+        """
+        summaries = dict(stored)
+        pending = [i for i, key in enumerate(keys) if key not in summaries]
+        if pending:
+            prompt_template = ChatPromptTemplate.from_messages([
+                ("system", ARTICLE_SYSTEM_PROMPT),
+                ("user", "title: {title}\ncontent: {content}")
+            ])
+            prompts = [
+                prompt_template.format(
+                    title=news_data[i].get("title", ""),
+                    content=truncate_to_tokens(_article_text(news_data[i]), self.article_token_budget),
+                )
+                for i in pending
+            ]
+            responses = self.model.batch(
+                prompts, config={"max_concurrency": self.max_concurrency}, return_exceptions=True
+            )
+            new_summaries = [
+                (keys[i], response.content) for i, response in zip(pending, responses)
+                if not isinstance(response, Exception)
+            ]
+            summaries.update(new_summaries)
+            self.store.save_article_summaries([key + (summary,) for key, summary in new_summaries], self._summarizer())
+
+        # Fall back to the truncated article text when a single map call fails
+        return [
+            summaries.get(key) or truncate_to_tokens(_article_text(news), self.article_token_budget)
+            for news, key in zip(news_data, keys)
+        ]
+
+    @staticmethod
+    def _article_key(news):
+        """
+        This function identifies one version of an article by its canonical URL and a hash of its text.
+        """
+        content_hash = make_cache_key(" ".join(news.get("title", "").split()), " ".join(news.get("content", "").split()))
+        return canonicalize_url(news.get("url", "")), content_hash
 
-        # Invoke the model
-        response = self.model.invoke(prompt_template.format(articles=new_content))
-        return {"summary": response.content}
+    @staticmethod
+    def _normalize_articles(news_data):
+        """
+        This function reduces the articles to an order-independent form for hashing.
+        """
+        return sorted(
+            (
+                news.get("url", "").strip().rstrip("/").lower(),
+                " ".join(news.get("title", "").split()),
+                " ".join(news.get("content", "").split()),
+                news.get("published_date", "") or "",
+            )
+            for news in news_data
+        )
 
     def save_ai_results(self, state: dict) -> dict:
         """
-        This function saves the AI news results (optional).
+        This function appends the fetched articles and the digest to the digest store.
         """
-        frequency = state.get("frequency", "daily")
+        news_data = state.get("news_data", [])
         summary = state.get("summary", "")
-        
-        # Ensure data directory exists
-        try:
-            if not os.path.exists("../data"):
-                os.makedirs("../data")
-                
-            file_name = f"../data/ai_news_results_{frequency}.md"
-            with open(file_name, "w") as f:
-                f.write(f"# AI News Results ({frequency.capitalize()})\n\n")
-                f.write(summary)
-            return {"file_name": file_name}
-        except Exception:
+        if not news_data or not summary:
             return {}
 
-        
\ No newline at end of file
+        new_articles = self.store.save_articles(news_data)
+        self.store.save_digest(
+            state.get("frequency", "daily"), summary,
+            provider=get_provider_name(self.model), model=get_model_name(self.model), source=state.get("source") or "ui",
+        )
+        return {"new_articles": new_articles}
+
+    def save_all_results(self, state: dict) -> dict:
+        """
+        This function appends the fetched articles and every frequency's digest to the digest store.
+        """
+        summaries = state.get("summaries", {})
+        new_articles = self.store.save_articles(state.get("news_data", []))
+        for frequency, articles in state.get("news_by_frequency", {}).items():
+            if articles and summaries.get(frequency):
+                self.store.save_digest(
+                    frequency, summaries[frequency],
+                    provider=get_provider_name(self.model), model=get_model_name(self.model),
+                    source=state.get("source") or "ui",
+                )
+        return {"summary": summaries.get(state.get("frequency"), NO_NEWS_SUMMARY), "new_articles": new_articles}
+
+
+def _article_text(news):
+    """
+    This function returns the text of an article to send to the model: the compressed text when there is one.
+    """
+    return news.get("compressed_content") or news.get("content", "")
+
+
+def _digest_items(digest):
+    """
+    This function maps the canonical URL of every "- [Summary](URL)" item of a digest to its summary.
+    """
+    return {canonicalize_url(url): summary.strip() for summary, url in DIGEST_ITEM_PATTERN.findall(digest or "")}
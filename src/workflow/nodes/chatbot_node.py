@@ -1,11 +1,51 @@
+from langchain_core.messages import AIMessage, HumanMessage
 from src.workflow.states.chatbot_state import Chatbot_state
+from src.workflow.cache.ttl_cache import make_cache_key
+from src.workflow.llms.model_info import get_model_name
 
 class Chatbot_node:
-    def __init__(self, model):
+    def __init__(self, model, context_window=None, semantic_cache=None):
         self.model = model
+        self.context_window = context_window
+        self.semantic_cache = semantic_cache
 
     def process(self, state: Chatbot_state):
         """
         This function processes the state of the chatbot.
         """
-        return {"messages": self.model.invoke(state['messages'])} 
\ No newline at end of file
+        # Near-identical questions asked in the same context are answered from the semantic cache
+        question, context_key = self._semantic_cache_key(state['messages'])
+        if question is not None:
+            answer = self.semantic_cache.lookup(question, context_key)
+            if answer is not None:
+                return {"messages": AIMessage(content=answer)}
+
+        if self.context_window is None:
+            update = {"messages": self.model.invoke(state['messages'])}
+        else:
+            # Send only the token-budgeted window; the running summary is kept in the graph state
+            messages, summary_state = self.context_window.build(
+                state['messages'],
+                {"summary": state.get("context_summary", ""), "folded": state.get("context_folded", 0)},
+            )
+            update = {
+                "messages": self.model.invoke(messages),
+                "context_summary": summary_state["summary"],
+                "context_folded": summary_state["folded"],
+            }
+
+        response = update["messages"]
+        if question is not None and response.content and not response.tool_calls:
+            self.semantic_cache.add(question, response.content, context_key)
+        return update
+
+    def _semantic_cache_key(self, messages):
+        """
+        This function returns the user question and the context it was asked in, or (None, None) when caching does not apply.
+        """
+        if self.semantic_cache is None or not messages or not isinstance(messages[-1], HumanMessage):
+            return None, None
+        # Answers only carry over between conversations that end in the same previous reply
+        previous_reply = next((m.content for m in reversed(messages[:-1]) if isinstance(m, AIMessage)), "")
+        context_key = make_cache_key(model=get_model_name(self.model), previous_reply=previous_reply)
+        return str(messages[-1].content), context_key
@@ -1,7 +1,11 @@
 from langgraph.prebuilt import ToolNode
 
-def Tools_node(tools):
+# Upper bound on tool calls from one AI message that run at the same time
+MAX_TOOL_CONCURRENCY = 4
+
+def Tools_node(tools, max_concurrency=MAX_TOOL_CONCURRENCY):
     """
     This function created a tool node and return for the graph.
+    Several tool calls in one AI message run concurrently, at most max_concurrency at a time.
     """
-    return ToolNode(tools=tools)
\ No newline at end of file
+    return ToolNode(tools=tools).with_config(max_concurrency=max_concurrency)
@@ -0,0 +1,195 @@
+import logging
+import os
+import random
+import threading
+import time
+
+from src.workflow.cache.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Per-provider limits for outbound calls:
+# rate/burst feed a token bucket (requests per second), max_concurrency caps calls in flight,
+# retries/base_delay/max_delay drive jittered exponential backoff, deadline bounds the whole call in seconds.
+OUTBOUND_POLICIES = {
+    "groq": {"rate": 0.5, "burst": 5, "max_concurrency": 8, "retries": 4, "base_delay": 0.5, "max_delay": 8.0, "deadline": 90.0},
+    "openai": {"rate": 5.0, "burst": 10, "max_concurrency": 16, "retries": 4, "base_delay": 0.5, "max_delay": 8.0, "deadline": 90.0},
+    "gemini": {"rate": 1.0, "burst": 5, "max_concurrency": 8, "retries": 4, "base_delay": 0.5, "max_delay": 8.0, "deadline": 90.0},
+    "tavily": {"rate": 2.0, "burst": 10, "max_concurrency": 8, "retries": 3, "base_delay": 0.5, "max_delay": 4.0, "deadline": 30.0},
+    "default": {"rate": 2.0, "burst": 5, "max_concurrency": 8, "retries": 3, "base_delay": 0.5, "max_delay": 8.0, "deadline": 60.0},
+}
+
+# Optional process-wide cap on calls in flight per provider, across all API keys (0 = no cap)
+GLOBAL_MAX_CONCURRENCY = int(os.environ.get("AI_NEWS_OUTBOUND_MAX_CONCURRENCY", "0") or 0)
+
+# Marks an empty stream
+_END = object()
+
+TRANSIENT_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+TRANSIENT_ERROR_NAMES = ("RateLimit", "Timeout", "Connection", "ServiceUnavailable", "InternalServer", "ResourceExhausted", "Overloaded")
+
+
+def is_transient(error):
+    """
+    This function tells whether a failed call is worth retrying (rate limits, timeouts, 5xx).
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status in TRANSIENT_STATUS_CODES:
+        return True
+    return any(name in type(error).__name__ for name in TRANSIENT_ERROR_NAMES)
+
+
+def _retry_after(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    This class allows rate requests per second on average with bursts of up to capacity.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline):
+        """
+        This function blocks until a token is available, raising TimeoutError if that would pass the deadline.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                raise TimeoutError("Rate limit wait would exceed the call deadline")
+            time.sleep(wait)
+
+
+class OutboundClient:
+    """
+    This class is the shared gate for outbound calls to one provider account: identical concurrent calls are
+    coalesced, calls are rate limited and capped in concurrency, and transient failures are retried
+    with jittered exponential backoff under an overall deadline.
+    ceiling is an optional semaphore shared by the clients of all accounts of the provider.
+    """
+    def __init__(self, provider, policy=None, ceiling=None):
+        self.provider = provider
+        self.policy = policy or OUTBOUND_POLICIES.get(provider, OUTBOUND_POLICIES["default"])
+        self.bucket = TokenBucket(self.policy["rate"], self.policy["burst"])
+        self.slots = threading.BoundedSemaphore(self.policy["max_concurrency"])
+        self.ceiling = ceiling
+        self.single_flight = SingleFlight()
+        self.retries = 0
+
+    def call(self, fn, key=None, deadline=None):
+        """
+        This function runs fn() through the gate. Calls sharing a key while one is in flight share its result.
+        """
+        deadline_at = time.monotonic() + (deadline or self.policy["deadline"])
+        if key is None:
+            return self._call_with_retry(fn, deadline_at)
+        return self.single_flight.do(key, lambda: self._call_with_retry(fn, deadline_at))
+
+    def stream(self, open_stream, key=None, deadline=None):
+        """
+        This function yields the chunks of the stream open_stream() returns, through the gate. Retries cover
+        opening the stream up to its first chunk, and the call slot is held until the stream ends.
+        Streams sharing a key while one is in flight get its chunks instead of calling again.
+        """
+        deadline_at = time.monotonic() + (deadline or self.policy["deadline"])
+        if key is None:
+            return self._stream_with_retry(open_stream, deadline_at)
+        return self.single_flight.do_stream(key, lambda: self._stream_with_retry(open_stream, deadline_at))
+
+    def _call_with_retry(self, fn, deadline_at):
+        attempt = 0
+        while True:
+            self._acquire(deadline_at)
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._backoff(e, attempt, deadline_at)
+                attempt += 1
+            finally:
+                self._release()
+            time.sleep(delay)
+
+    def _stream_with_retry(self, open_stream, deadline_at):
+        attempt = 0
+        while True:
+            self._acquire(deadline_at)
+            try:
+                stream = iter(open_stream())
+                first = next(stream, _END)
+            except Exception as e:
+                self._release()
+                delay = self._backoff(e, attempt, deadline_at)
+                attempt += 1
+                time.sleep(delay)
+                continue
+            try:
+                if first is not _END:
+                    yield first
+                    yield from stream
+            finally:
+                self._release()
+            return
+
+    def _acquire(self, deadline_at):
+        self.bucket.acquire(deadline_at)
+        if not self.slots.acquire(timeout=max(0.0, deadline_at - time.monotonic())):
+            raise TimeoutError(f"No free {self.provider} call slot before the deadline")
+        if self.ceiling and not self.ceiling.acquire(timeout=max(0.0, deadline_at - time.monotonic())):
+            self.slots.release()
+            raise TimeoutError(f"No free {self.provider} call slot before the deadline")
+
+    def _release(self):
+        if self.ceiling:
+            self.ceiling.release()
+        self.slots.release()
+
+    def _backoff(self, error, attempt, deadline_at):
+        """
+        This function returns how long to wait before retrying a failed attempt, or re-raises its error.
+        """
+        if attempt >= self.policy["retries"] or not is_transient(error):
+            raise error
+        # Full jitter, but never sooner than the provider asked for
+        delay = random.uniform(0, min(self.policy["max_delay"], self.policy["base_delay"] * 2 ** attempt))
+        delay = max(delay, _retry_after(error) or 0.0)
+        if time.monotonic() + delay > deadline_at:
+            raise error
+        logger.warning("Retrying %s call in %.2fs after %s", self.provider, delay, type(error).__name__)
+        self.retries += 1
+        return delay
+
+
+_clients = {}
+_ceilings = {}
+_clients_lock = threading.Lock()
+
+
+def get_outbound_client(provider, account=""):
+    """
+    This function returns the process-wide outbound client for one provider account. account identifies
+    the API key (its hash_secret fingerprint), so every key gets its own rate limit, call slots and coalescing.
+    """
+    with _clients_lock:
+        if (provider, account) not in _clients:
+            if GLOBAL_MAX_CONCURRENCY and provider not in _ceilings:
+                _ceilings[provider] = threading.BoundedSemaphore(GLOBAL_MAX_CONCURRENCY)
+            _clients[provider, account] = OutboundClient(provider, ceiling=_ceilings.get(provider))
+        return _clients[provider, account]
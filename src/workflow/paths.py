@@ -0,0 +1,14 @@
+import os
+
+# Root directory for everything the app persists locally (caches, stores, archives).
+# Relative to the working directory, like the config path used by the UI.
+DATA_DIR = os.environ.get("AI_NEWS_DATA_DIR", "./data")
+
+
+def data_path(*parts):
+    """
+    This function returns a path inside the data directory, creating parent folders.
+    """
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return path
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage
+from src.workflow.memory.checkpointer import clear_thread, thread_config
+from src.workflow.metrics.callbacks import MetricsCallbackHandler
+from src.workflow.nodes.ai_news_summarizer_node import DIGEST_STREAM_TAG
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs stay available to late pollers (e.g. after a page navigation) for this long, in seconds
+JOB_RETENTION = 10 * 60
+# How often expired jobs are purged when nothing is submitted, in seconds
+PURGE_INTERVAL = 60
+
+# Progress label shown while each node of the AI news graph runs
+NODE_STAGES = {
+    "fetch_ai_news": "Fetching the news",
+    "compress_articles": "Compressing articles",
+    "summarize_ai_news": "Summarizing",
+    "summarize_frequency": "Summarizing every time frame",
+    "save_ai_results": "Saving",
+}
+
+
+class DigestJob:
+    """
+    This class holds the state of one digest run; the queue updates it from the worker thread.
+    """
+    def __init__(self, key, frequency):
+        self.key = key
+        self.frequency = frequency
+        self.status = "queued"
+        self.stage = "Queued"
+        self.partial = ""
+        self.summary = ""
+        self.error = None
+        self.trace = []
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+    def snapshot(self):
+        return {
+            "key": self.key,
+            "frequency": self.frequency,
+            "status": self.status,
+            "stage": self.stage,
+            "partial": self.partial,
+            "summary": self.summary,
+            "error": self.error,
+            "trace": list(self.trace),
+            "elapsed": (self.finished_at or time.time()) - self.submitted_at,
+        }
+
+
+class _ProgressHandler(BaseCallbackHandler):
+    def __init__(self, job):
+        self.job = job
+
+    def on_chain_start(self, serialized, inputs, *, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node:
+            self.job.stage = NODE_STAGES.get(node, node)
+
+
+class DigestJobQueue:
+    """
+    This class runs AI news digest jobs on background threads, off the Streamlit script thread.
+    Jobs are keyed by frequency and model: submitting a job that is already queued or running joins it.
+    """
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="digest-job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+        threading.Thread(target=self._purge_forever, daemon=True, name="digest-job-purge").start()
+
+    def submit(self, key, graph, frequency):
+        """
+        This function queues a digest run of the compiled graph and returns the job key.
+        """
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(key)
+            if job is not None and job.status in ("queued", "running"):
+                return key
+            job = DigestJob(key, frequency)
+            self._jobs[key] = job
+        self._executor.submit(self._run, job, graph)
+        return key
+
+    def get(self, key):
+        """
+        This function returns a snapshot of the job, or None if it is unknown or expired.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            return job.snapshot() if job is not None else None
+
+    def _run(self, job, graph):
+        job.status = "running"
+        metrics_handler = MetricsCallbackHandler(use_case="AI News Summarizer")
+        # Each run gets its own checkpointed thread, deleted afterwards, so no run inherits or grows another's state
+        thread_id = f"digest-job-{uuid.uuid4().hex}"
+        config = dict(thread_config(thread_id))
+        config["callbacks"] = [metrics_handler, _ProgressHandler(job)]
+        try:
+            for mode, payload in graph.stream(
+                {"messages": [HumanMessage(content=job.frequency)]}, config=config, stream_mode=["messages", "updates"]
+            ):
+                if mode == "messages":
+                    chunk, metadata = payload
+                    if metadata.get(DIGEST_STREAM_TAG) and isinstance(chunk, AIMessage) and chunk.content:
+                        job.partial += chunk.content
+                else:
+                    for value in payload.values():
+                        if value and value.get("summary"):
+                            job.summary = value["summary"]
+            job.status = "done" if job.summary else "failed"
+            if not job.summary:
+                job.error = "No summary was generated."
+        except Exception as e:
+            logger.error("Digest job %s failed: %s", job.key, e)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.trace = metrics_handler.trace
+            job.finished_at = time.time()
+            try:
+                clear_thread(thread_id)
+            except Exception as e:
+                logger.warning("Could not delete the checkpoints of digest job %s: %s", job.key, e)
+
+    def _purge_forever(self):
+        while True:
+            time.sleep(PURGE_INTERVAL)
+            with self._lock:
+                self._purge()
+
+    def _purge(self):
+        now = time.time()
+        for key in [k for k, job in self._jobs.items() if job.finished_at and now - job.finished_at > JOB_RETENTION]:
+            del self._jobs[key]
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_digest_job_queue():
+    """
+    This function returns the process-wide digest job queue.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = DigestJobQueue()
+        return _queue
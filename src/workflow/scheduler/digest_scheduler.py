@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+
+from langchain_core.messages import HumanMessage
+from src.workflow.metrics.callbacks import MetricsCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+# How often each digest is recomputed, in seconds
+DIGEST_REFRESH_INTERVALS = {"daily": 60 * 60, "weekly": 6 * 60 * 60, "monthly": 24 * 60 * 60}
+
+
+class DigestScheduler:
+    """
+    This class precomputes the AI news digests on a schedule. It runs the compiled AI news summarizer graph
+    directly, without any Streamlit context; the graph's save step appends each digest to the store.
+    """
+    def __init__(self, graph, store, intervals=None):
+        self.graph = graph
+        self.store = store
+        self.intervals = intervals or DIGEST_REFRESH_INTERVALS
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Digests that are still fresh in the store (e.g. after a restart) are not recomputed
+        self._next_run = {}
+        for frequency, interval in self.intervals.items():
+            latest = self.store.latest_digest(frequency, source="scheduler")
+            self._next_run[frequency] = latest["created_at"] + interval if latest else 0.0
+
+    def run_once(self, frequency):
+        """
+        This function computes (and, through the graph, stores) one digest.
+        """
+        start = time.perf_counter()
+        state = self.graph.invoke(
+            {"messages": [HumanMessage(content=frequency)], "source": "scheduler"},
+            config={"callbacks": [MetricsCallbackHandler(use_case="scheduled digest")]},
+        )
+        summary = state.get("summary", "")
+        logger.info("Precomputed %s digest in %.1fs", frequency, time.perf_counter() - start)
+        return summary
+
+    def run_due(self):
+        """
+        This function computes every digest whose refresh time has passed.
+        """
+        for frequency, interval in self.intervals.items():
+            if time.time() < self._next_run[frequency]:
+                continue
+            try:
+                self.run_once(frequency)
+                self._next_run[frequency] = time.time() + interval
+            except Exception as e:
+                # Retry sooner than the full interval after a failure
+                logger.error("Failed to precompute %s digest: %s", frequency, e)
+                self._next_run[frequency] = time.time() + min(interval, 5 * 60)
+
+    def run_forever(self, poll_interval=30):
+        """
+        This function runs the schedule on the current thread until stop() is called.
+        """
+        while not self._stop.is_set():
+            self.run_due()
+            self._stop.wait(poll_interval)
+
+    def start(self, poll_interval=30):
+        """
+        This function runs the schedule on a daemon thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, args=(poll_interval,), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -1,5 +1,6 @@
 from typing_extensions import TypedDict, List
 from typing import Annotated
+import operator
 from langgraph.graph.message import add_messages
 
 class Chatbot_state(TypedDict):
@@ -9,4 +10,11 @@ class Chatbot_state(TypedDict):
     messages: Annotated[List, add_messages] # List of messages
     summary: str # Summary of the news
     news_data: List # List of news data
-    frequency: str # Frequency of the news
\ No newline at end of file
+    frequency: str # Frequency of the news
+    compression_ratio: float # Article tokens kept by extractive compression, as a fraction of the fetched ones
+    news_by_frequency: dict # URLs of the fetched articles in each frequency's window (multi-frequency mode)
+    summaries: Annotated[dict, operator.or_] # Digest per frequency, merged from the parallel branches
+    new_articles: int # Number of fetched articles not already in the digest store
+    source: str # Who requested the digest: "scheduler" for precomputed digests, "ui" (default) otherwise
+    context_summary: str # Running summary of the messages folded out of the context window
+    context_folded: int # Number of leading messages already folded into context_summary
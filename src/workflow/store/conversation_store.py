@@ -0,0 +1,213 @@
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from src.workflow.paths import data_path
+
+# Entries larger than this many bytes are kept zlib-compressed
+COMPRESS_THRESHOLD = 1024
+# Memory budget per session; older entries beyond it are read back from disk
+SESSION_MEMORY_CAP = 256 * 1024
+# Sessions kept in memory at once, and how long an untouched one stays there, in seconds
+MAX_SESSIONS = 256
+IDLE_TTL = 15 * 60
+
+
+def _pack(content):
+    data = (content or "").encode("utf-8")
+    return zlib.compress(data) if len(data) > COMPRESS_THRESHOLD else content or ""
+
+
+def _unpack(payload):
+    return zlib.decompress(payload).decode("utf-8") if isinstance(payload, bytes) else payload
+
+
+def _size(payload):
+    return len(payload) if isinstance(payload, bytes) else len(payload.encode("utf-8"))
+
+
+class _Session:
+    def __init__(self, length=0):
+        # In memory: entries[i] is position memory_start + i; every position is also on disk
+        self.entries = []
+        self.memory_start = length
+        self.length = length
+        self.nbytes = 0
+        self.last_access = time.time()
+
+
+class ConversationStore:
+    """
+    This class keeps the UI histories of all sessions server side in SQLite, with compressed large entries.
+    Entries are written through to disk as they are added; memory holds a capped cache of each session's
+    newest entries, and idle and least recently used sessions are dropped from it.
+    Streamlit session state only holds the session id.
+    """
+    def __init__(self, path=None, max_sessions=MAX_SESSIONS, session_memory_cap=SESSION_MEMORY_CAP, idle_ttl=IDLE_TTL):
+        self.max_sessions = max_sessions
+        self.session_memory_cap = session_memory_cap
+        self.idle_ttl = idle_ttl
+        self._lock = threading.RLock()
+        self._sessions = OrderedDict()
+        self._conn = sqlite3.connect(path or data_path("conversations.sqlite"), check_same_thread=False)
+        # Every append is a small transaction; WAL keeps those cheap
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                session_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content BLOB NOT NULL,
+                PRIMARY KEY (session_id, position)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def history(self, session_id):
+        """
+        This function returns the list-like history of a session.
+        """
+        return ConversationHistory(self, session_id)
+
+    def length(self, session_id):
+        with self._lock:
+            return self._session(session_id).length
+
+    def get(self, session_id, index):
+        """
+        This function returns one entry as a {"role", "content"} dict, reading it from disk if it is not cached in memory.
+        """
+        with self._lock:
+            session = self._session(session_id)
+            if index < 0:
+                index += session.length
+            if not 0 <= index < session.length:
+                raise IndexError(index)
+            if index >= session.memory_start:
+                role, payload = session.entries[index - session.memory_start]
+            else:
+                role, payload = self._conn.execute(
+                    "SELECT role, content FROM entries WHERE session_id = ? AND position = ?", (session_id, index)
+                ).fetchone()
+        return {"role": role, "content": _unpack(payload)}
+
+    def extend(self, session_id, entries):
+        """
+        This function appends entries to a session, writing them to disk right away, and drops its oldest
+        entries from memory beyond the memory cap.
+        """
+        with self._lock:
+            session = self._session(session_id)
+            rows = [(entry["role"], _pack(entry.get("content", ""))) for entry in entries]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (session_id, position, role, content) VALUES (?, ?, ?, ?)",
+                    [(session_id, session.length + i, role, payload) for i, (role, payload) in enumerate(rows)],
+                )
+            for row in rows:
+                session.entries.append(row)
+                session.nbytes += _size(row[1])
+                session.length += 1
+
+            # Keep the newest entry in memory even when it alone exceeds the cap
+            drop = 0
+            while session.nbytes > self.session_memory_cap and drop < len(session.entries) - 1:
+                session.nbytes -= _size(session.entries[drop][1])
+                drop += 1
+            if drop:
+                del session.entries[:drop]
+                session.memory_start += drop
+
+    def clear(self, session_id):
+        with self._lock:
+            self._sessions[session_id] = _Session()
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE session_id = ?", (session_id,))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions_in_memory": len(self._sessions),
+                "memory_bytes": sum(session.nbytes for session in self._sessions.values()),
+            }
+
+    def _session(self, session_id):
+        now = time.time()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._load(session_id)
+            self._sessions[session_id] = session
+        session.last_access = now
+        self._sessions.move_to_end(session_id)
+
+        # Least recently used sessions come first: drop the idle ones and any above the session limit
+        while len(self._sessions) > 1:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - oldest.last_access < self.idle_ttl:
+                break
+            del self._sessions[oldest_id]
+        return session
+
+    def _load(self, session_id):
+        # Bring the newest entries that fit the memory cap back from disk
+        length = self._conn.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM entries WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+        session = _Session(length)
+        for position, role, payload in self._conn.execute(
+            "SELECT position, role, content FROM entries WHERE session_id = ? ORDER BY position DESC", (session_id,)
+        ):
+            if session.entries and session.nbytes + _size(payload) > self.session_memory_cap:
+                break
+            session.entries.insert(0, (role, payload))
+            session.nbytes += _size(payload)
+            session.memory_start = position
+        return session
+
+
+class ConversationHistory:
+    """
+    This class is a list-like view of one session's history in the conversation store.
+    """
+    def __init__(self, store, session_id):
+        self.store = store
+        self.session_id = session_id
+
+    def __len__(self):
+        return self.store.length(self.session_id)
+
+    def __getitem__(self, index):
+        return self.store.get(self.session_id, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, entry):
+        self.store.extend(self.session_id, [entry])
+
+    def extend(self, entries):
+        self.store.extend(self.session_id, list(entries))
+
+    def clear(self):
+        self.store.clear(self.session_id)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store():
+    """
+    This function returns the process-wide conversation store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConversationStore()
+        return _store
@@ -0,0 +1,267 @@
+import sqlite3
+import threading
+import time
+import zlib
+
+from src.workflow.paths import data_path
+from src.workflow.utils.dates import parse_published_date
+from src.workflow.utils.dedup import canonicalize_url
+
+# Large text fields are stored zlib-compressed
+COMPRESSION_LEVEL = 6
+
+_DIGEST_COLUMNS = ("id", "frequency", "provider", "model", "source", "created_at", "summary")
+_ARTICLE_COLUMNS = ("url", "title", "published_date", "published_at", "first_seen", "content")
+
+
+def _compress(text):
+    return zlib.compress((text or "").encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def _decompress(value):
+    # Rows written before compression was introduced hold plain text
+    return zlib.decompress(value).decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _fts_query(keyword):
+    # Quote every term so user input never reaches the FTS5 query syntax
+    return " ".join('"' + term.replace('"', '""') + '"' for term in keyword.split())
+
+
+class DigestStore:
+    """
+    This class keeps the AI news digests and the articles they were built from in a shared, append-only SQLite file.
+    Articles are keyed by canonical URL, large fields are compressed, and an FTS5 index serves keyword search.
+    """
+    def __init__(self, path=None):
+        self.path = path or data_path("digests.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS digests (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                frequency TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                summary TEXT NOT NULL
+            )
+            """
+        )
+        # source tells digests precomputed by the scheduler ("scheduler") from those of UI runs ("ui")
+        if "source" not in {row[1] for row in self._conn.execute("PRAGMA table_info(digests)")}:
+            self._conn.execute("ALTER TABLE digests ADD COLUMN source TEXT NOT NULL DEFAULT 'ui'")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS digests_frequency ON digests (frequency, created_at)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                published_date TEXT NOT NULL,
+                published_at REAL NOT NULL,
+                first_seen REAL NOT NULL,
+                content BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at)")
+        # Per-article summaries, keyed by article version and by the model and prompt that wrote them
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS article_summaries (
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                summarizer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                summary BLOB NOT NULL,
+                PRIMARY KEY (url, content_hash, summarizer)
+            )
+            """
+        )
+
+        # Contentless full-text indexes; their rowids point at the digests and articles rows
+        try:
+            self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS digests_fts USING fts5(summary, content='')")
+            self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, content, content='')")
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: keyword search falls back to article titles and a scan of the digests
+            self.full_text = False
+        self._conn.commit()
+
+    def save_digest(self, frequency, summary, provider="", model="", source="ui"):
+        """
+        This function stores a new digest for the frequency.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO digests (frequency, provider, model, source, created_at, summary) VALUES (?, ?, ?, ?, ?, ?)",
+                (frequency, provider, model, source, time.time(), _compress(summary)),
+            )
+            if self.full_text:
+                self._conn.execute("INSERT INTO digests_fts (rowid, summary) VALUES (?, ?)", (cursor.lastrowid, summary))
+            return cursor.lastrowid
+
+    def save_articles(self, articles):
+        """
+        This function stores the articles not seen before in one transaction and returns how many were new.
+        """
+        now = time.time()
+        rows = {}
+        for article in articles:
+            url = canonicalize_url(article.get("url", ""))
+            if url and url not in rows:
+                published_date = article.get("published_date", "") or ""
+                rows[url] = (
+                    url, article.get("title", ""), published_date, parse_published_date(published_date, now), now,
+                    article.get("content", "") or "",
+                )
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            known = {
+                row[0] for row in self._conn.execute(
+                    f"SELECT url FROM articles WHERE url IN ({','.join('?' * len(rows))})", list(rows)
+                )
+            }
+            new_rows = [row for url, row in rows.items() if url not in known]
+            self._conn.executemany(
+                "INSERT INTO articles (url, title, published_date, published_at, first_seen, content) VALUES (?, ?, ?, ?, ?, ?)",
+                [row[:5] + (_compress(row[5]),) for row in new_rows],
+            )
+            if self.full_text and new_rows:
+                placeholders = ",".join("?" * len(new_rows))
+                rowids = dict(self._conn.execute(
+                    f"SELECT url, rowid FROM articles WHERE url IN ({placeholders})", [row[0] for row in new_rows]
+                ))
+                self._conn.executemany(
+                    "INSERT INTO articles_fts (rowid, title, content) VALUES (?, ?, ?)",
+                    [(rowids[row[0]], row[1], row[5]) for row in new_rows],
+                )
+        return len(new_rows)
+
+    def get_article_summaries(self, keys, summarizer):
+        """
+        This function returns the stored summaries of the given (url, content_hash) pairs, keyed by pair.
+        """
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        # Stay well below SQLite's limit on bound parameters
+        for start in range(0, len(keys), 400):
+            chunk = keys[start:start + 400]
+            where = " OR ".join("(url = ? AND content_hash = ?)" for _ in chunk)
+            params = [value for key in chunk for value in key]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT url, content_hash, summary FROM article_summaries WHERE summarizer = ? AND ({where})",
+                    [summarizer] + params,
+                ).fetchall()
+            found.update({(url, content_hash): _decompress(summary) for url, content_hash, summary in rows})
+        return found
+
+    def save_article_summaries(self, summaries, summarizer):
+        """
+        This function stores (url, content_hash, summary) triples in one transaction.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO article_summaries (url, content_hash, summarizer, created_at, summary) VALUES (?, ?, ?, ?, ?)",
+                [(url, content_hash, summarizer, now, _compress(summary)) for url, content_hash, summary in summaries],
+            )
+
+    def latest_digest(self, frequency, max_age=None, **filters):
+        """
+        This function returns the newest digest for the frequency, or None if there is none young enough.
+        filters (source, provider, model) are passed on to list_digests.
+        """
+        since = time.time() - max_age if max_age is not None else None
+        digests = self.list_digests(frequency, since=since, limit=1, **filters)
+        return digests[0] if digests else None
+
+    def list_digests(self, frequency=None, since=None, until=None, keyword=None, limit=20, source=None, provider=None, model=None):
+        """
+        This function returns digests, newest first, filtered by frequency, creation time range, keyword,
+        and by who wrote them (source, provider, model).
+        """
+        query = f"SELECT {', '.join('d.' + c for c in _DIGEST_COLUMNS)} FROM digests d"
+        conditions, params = [], []
+        if keyword and self.full_text:
+            query += " JOIN digests_fts ON digests_fts.rowid = d.id"
+            conditions.append("digests_fts MATCH ?")
+            params.append(_fts_query(keyword))
+        if frequency:
+            conditions.append("d.frequency = ?")
+            params.append(frequency)
+        for column, value in (("source", source), ("provider", provider), ("model", model)):
+            if value is not None:
+                conditions.append(f"d.{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("d.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("d.created_at < ?")
+            params.append(until)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY d.created_at DESC"
+        # Without FTS5 the compressed summaries are matched after decompression
+        scan = keyword and not self.full_text
+        if not scan:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        digests = [dict(zip(_DIGEST_COLUMNS, row[:-1] + (_decompress(row[-1]),))) for row in rows]
+        if scan:
+            digests = [d for d in digests if keyword.lower() in d["summary"].lower()][:limit]
+        return digests
+
+    def search_articles(self, keyword=None, since=None, until=None, limit=20):
+        """
+        This function returns stored articles, newest first, filtered by publication time range and keyword.
+        """
+        query = f"SELECT {', '.join('a.' + c for c in _ARTICLE_COLUMNS)} FROM articles a"
+        conditions, params = [], []
+        if keyword:
+            if self.full_text:
+                query += " JOIN articles_fts ON articles_fts.rowid = a.rowid"
+                conditions.append("articles_fts MATCH ?")
+                params.append(_fts_query(keyword))
+            else:
+                conditions.append("a.title LIKE ?")
+                params.append(f"%{keyword}%")
+        if since is not None:
+            conditions.append("a.published_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("a.published_at < ?")
+            params.append(until)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY a.published_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(zip(_ARTICLE_COLUMNS, row[:-1] + (_decompress(row[-1]),))) for row in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_digest_store():
+    """
+    This function returns the process-wide digest store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DigestStore()
+        return _store
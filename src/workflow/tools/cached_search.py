@@ -0,0 +1,54 @@
+from typing import Any
+
+from langchain_core.tools import BaseTool
+from src.workflow.cache.single_flight import SingleFlight
+from src.workflow.cache.ttl_cache import get_ttl_cache, make_cache_key
+from src.workflow.outbound.outbound_client import get_outbound_client
+from src.workflow.tools.tools import tavily_account
+from src.workflow.utils.text import normalize_query
+
+# How long a web search result is reused, in seconds
+SEARCH_RESULT_TTL = 10 * 60
+
+_in_flight = SingleFlight()
+
+
+class CachedSearchTool(BaseTool):
+    """
+    This class wraps a web search tool with a normalized-query TTL cache shared across sessions.
+    Identical searches that are already running are coalesced into a single request.
+    """
+    search_tool: Any
+    ttl: int = SEARCH_RESULT_TTL
+
+    @classmethod
+    def wrap(cls, search_tool, ttl=SEARCH_RESULT_TTL):
+        """
+        This function returns the cached tool with the same name, description and arguments as search_tool.
+        """
+        return cls(
+            search_tool=search_tool,
+            ttl=ttl,
+            name=search_tool.name,
+            description=search_tool.description,
+            args_schema=search_tool.args_schema,
+        )
+
+    def _run(self, **kwargs):
+        cache = get_ttl_cache("web_search")
+        params = dict(kwargs)
+        params["query"] = normalize_query(params.get("query", ""))
+        cache_key = make_cache_key(tool=self.name, **params)
+
+        result = cache.get(cache_key)
+        if result is not None:
+            return result
+
+        def search():
+            result = get_outbound_client("tavily", tavily_account()).call(lambda: self.search_tool.invoke(kwargs))
+            # Errors are returned as results by the search tool; they are not worth caching
+            if not (isinstance(result, dict) and "error" in result):
+                cache.set(cache_key, result, self.ttl)
+            return result
+
+        return _in_flight.do(cache_key, search)
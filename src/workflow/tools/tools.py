@@ -1,10 +1,40 @@
-from langchain_tavily import TavilySearch
+import os
+
+from src.workflow.cache.resource_pool import get_resource_pool, hash_secret
+
+# Optional override of the Tavily endpoint (e.g. a local stand-in for load tests)
+TAVILY_API_BASE_URL = os.environ.get("TAVILY_API_BASE_URL")
+_ENDPOINT = {"api_base_url": TAVILY_API_BASE_URL} if TAVILY_API_BASE_URL else {}
+
 
 def get_tools():
     """
     Returns the list of tools for the chatbot.
+    The tools are shared by every session that uses the same Tavily API key,
+    and web search results are memoized across sessions.
+    """
+    # Imported on first use so sessions without web search never load the Tavily SDKs
+    from langchain_tavily import TavilySearch
+    from src.workflow.tools.cached_search import CachedSearchTool
+
+    key = ("tools", hash_secret(os.environ.get("TAVILY_API_KEY")))
+    return get_resource_pool("tools").get_or_create(
+        key, lambda: [CachedSearchTool.wrap(TavilySearch(max_results=2, **_ENDPOINT))]
+    )
+
+
+def get_tavily_client():
+    """
+    Returns the Tavily client shared by every session that uses the same Tavily API key.
     """
-    tools = [TavilySearch(max_results=2)]
-    return tools
+    from tavily import TavilyClient
+
+    key = ("tavily_client", hash_secret(os.environ.get("TAVILY_API_KEY")))
+    return get_resource_pool("tools").get_or_create(key, lambda: TavilyClient(**_ENDPOINT))
 
-    
\ No newline at end of file
+
+def tavily_account():
+    """
+    Returns the fingerprint of the Tavily API key in use, which selects its outbound client.
+    """
+    return hash_secret(os.environ.get("TAVILY_API_KEY"))
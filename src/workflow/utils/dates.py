@@ -0,0 +1,16 @@
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+
+def parse_published_date(published_date, default=None):
+    """
+    This function converts a Tavily published date (RFC 2822 or ISO 8601) to a timestamp, or returns default.
+    """
+    try:
+        return parsedate_to_datetime(published_date).timestamp()
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(published_date).timestamp()
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,91 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from src.workflow.utils.dates import parse_published_date
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ocid", "sr_share"}
+
+SIMHASH_BITS = 64
+_BIT_POSITIONS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def canonicalize_url(url):
+    """
+    This function normalizes an article URL so syndicated copies of the same link compare equal.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def simhash(text):
+    """
+    This function computes a 64-bit SimHash fingerprint over word 3-grams of the text.
+    """
+    words = re.findall(r"\w+", text.lower())
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))]
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingles],
+        dtype=np.uint64,
+    )
+    # A bit is set in the fingerprint when it is set in more than half of the shingle hashes
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    majority = 2 * bits.sum(axis=0) > len(shingles)
+    return int(np.bitwise_or.reduce(np.uint64(1) << _BIT_POSITIONS[majority], initial=np.uint64(0)))
+
+
+def hamming_distance(a, b):
+    """
+    This function returns the number of differing bits between two fingerprints.
+    """
+    return bin(a ^ b).count("1")
+
+
+def rank_articles(articles):
+    """
+    This function orders articles by search relevance score, newest first on ties.
+    """
+    # Dates are compared as timestamps; RFC 2822 strings ("Mon, ...") do not sort chronologically
+    return sorted(
+        articles,
+        key=lambda news: (news.get("score") or 0.0, parse_published_date(news.get("published_date"), 0.0)),
+        reverse=True,
+    )
+
+
+def dedupe_articles(articles, max_distance=3):
+    """
+    This function drops repeated articles, first by canonical URL and then by near-duplicate title and content.
+    Articles are ranked first, so the best scored copy of each story is the one kept.
+    Articles without content are only deduplicated by URL, since all empty texts share one fingerprint.
+    """
+    kept = []
+    seen_urls = set()
+    fingerprints = []
+    for news in rank_articles(articles):
+        url = canonicalize_url(news.get("url", ""))
+        if url and url in seen_urls:
+            continue
+
+        if (news.get("content") or "").strip():
+            fingerprint = simhash(f"{news.get('title', '')} {news.get('content', '')}")
+            if any(hamming_distance(fingerprint, other) <= max_distance for other in fingerprints):
+                continue
+            fingerprints.append(fingerprint)
+
+        seen_urls.add(url)
+        kept.append(news)
+    return kept
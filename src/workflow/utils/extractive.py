@@ -0,0 +1,103 @@
+import re
+
+import numpy as np
+
+from src.workflow.utils.text import QUERY_STOPWORDS, estimate_tokens, truncate_to_tokens
+
+# Lines that are page furniture rather than article text
+BOILERPLATE_PATTERNS = re.compile(
+    r"cookie|subscribe|sign up|sign in|log in|newsletter|advertisement|all rights reserved|read more|"
+    r"click here|share this|follow us|privacy policy|terms of (use|service)|skip to (main )?content|"
+    r"related articles|you may also like",
+    re.IGNORECASE,
+)
+# Earlier sentences earn a small bonus, since news leads carry the key facts
+LEAD_BONUS = 0.1
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'“(\[A-Z0-9])")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def strip_boilerplate(text):
+    """
+    This function drops navigation fragments, bare links and page furniture from scraped article text.
+    """
+    lines = []
+    for line in (text or "").splitlines():
+        line = re.sub(r"!?\[([^\]]*)\]\([^)]*\)", r"\1", line).strip(" \t#*|>-•»")
+        if not line or re.fullmatch(r"\S*https?://\S*", line):
+            continue
+        # Menus and breadcrumbs: separators, or a few words without sentence punctuation
+        if line.count("|") >= 2 or line.count("»") >= 1 or (len(line.split()) < 4 and not line.endswith((".", "!", "?"))):
+            continue
+        if len(line) < 200 and BOILERPLATE_PATTERNS.search(line):
+            continue
+        lines.append(line)
+    return " ".join(lines)
+
+
+def split_sentences(text):
+    """
+    This function splits a text into sentences and drops exact repeats.
+    """
+    sentences = []
+    seen = set()
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        key = sentence.lower()
+        if sentence and key not in seen:
+            seen.add(key)
+            sentences.append(sentence)
+    return sentences
+
+
+def rank_sentences(sentences):
+    """
+    This function scores sentences by the cosine similarity of their TF-IDF vector to the whole text's,
+    so sentences that carry the article's main terms rank first.
+    """
+    tokenized = [[w for w in _WORD.findall(s.lower()) if len(w) > 2 and w not in QUERY_STOPWORDS] for s in sentences]
+    vocabulary = {}
+    rows, columns = [], []
+    for row, words in enumerate(tokenized):
+        for word in words:
+            rows.append(row)
+            columns.append(vocabulary.setdefault(word, len(vocabulary)))
+    if not vocabulary:
+        return np.zeros(len(sentences))
+
+    counts = np.zeros((len(sentences), len(vocabulary)), dtype=np.float32)
+    np.add.at(counts, (rows, columns), 1.0)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    weights = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1) * idf
+
+    centroid = weights.sum(axis=0)
+    norms = np.linalg.norm(weights, axis=1) * np.linalg.norm(centroid)
+    scores = (weights @ centroid) / np.maximum(norms, 1e-9)
+    return scores + LEAD_BONUS / (1 + np.arange(len(sentences)))
+
+
+def compress_text(text, max_tokens):
+    """
+    This function strips boilerplate and keeps the highest-ranked sentences, in their original order,
+    within roughly max_tokens tokens.
+    """
+    sentences = split_sentences(strip_boilerplate(text))
+    if not sentences:
+        # Everything looked like boilerplate; keep the raw text rather than nothing
+        return truncate_to_tokens(" ".join((text or "").split()), max_tokens)
+    if sum(estimate_tokens(s) for s in sentences) <= max_tokens:
+        return " ".join(sentences)
+
+    order = np.argsort(-rank_sentences(sentences), kind="stable")
+    kept = []
+    budget = max_tokens
+    for index in order:
+        tokens = estimate_tokens(sentences[index])
+        if tokens <= budget:
+            kept.append(index)
+            budget -= tokens
+    if not kept:
+        # Not even one sentence fits: cut the best one down
+        return truncate_to_tokens(sentences[order[0]], max_tokens)
+    return " ".join(sentences[i] for i in sorted(kept))
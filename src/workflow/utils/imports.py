@@ -0,0 +1,9 @@
+import importlib
+
+
+def load_object(path):
+    """
+    This function imports "package.module:attribute" on first use and returns the attribute.
+    """
+    module_name, attribute = path.split(":")
+    return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,39 @@
+# Rough characters-per-token ratio shared by the tokenizers of the supported providers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """
+    This function estimates the number of tokens in a text without loading a tokenizer.
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    This function cuts a text down to roughly max_tokens tokens, on a word boundary.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if not text or len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut + " ..."
+
+
+# Words that carry no topic of their own (articles, prepositions, question and request words)
+QUERY_STOPWORDS = {
+    "a", "an", "the", "of", "on", "in", "for", "to", "and", "about", "is", "are", "what", "whats",
+    "me", "please", "tell", "show", "find", "search", "give", "some", "any",
+}
+
+
+def normalize_query(query):
+    """
+    This function lowercases a search query and collapses its whitespace, so trivial variants compare equal.
+    Word order is kept: "dog bites man" and "man bites dog" are different searches.
+    """
+    return " ".join((query or "").lower().split())
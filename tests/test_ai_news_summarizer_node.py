@@ -0,0 +1,74 @@
+import re
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from src.workflow.cache.lru_cache import LRUCache
+from src.workflow.nodes.ai_news_summarizer_node import AINewsSummarizerNode
+from src.workflow.store.digest_store import DigestStore
+from src.workflow.utils.text import estimate_tokens
+
+ARTICLE_PATTERN = re.compile(r"url: (\S*)\ndate: .*\ntitle: (.*)")
+
+
+class _DigestFakeChatModel(BaseChatModel):
+    """
+    Answers digest prompts with one "- [Summary](URL)" item per article and article prompts with a short summary.
+    """
+    model_name: str = "digest-fake"
+    prompts: list = []
+
+    @property
+    def _llm_type(self):
+        return "digest-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        if "news analyst" in prompt:
+            text = "Short summary of the article."
+        else:
+            text = "\n".join(f"**{title}**\n- [Summary of {title}]({url})" for url, title in ARTICLE_PATTERN.findall(prompt))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+def _article(name, sentences=8):
+    content = " ".join(f"The {name} team announced result number {i} of its new language model work." for i in range(sentences))
+    return {"url": f"https://news.example.com/{name}", "title": f"{name} story", "content": content,
+            "published_date": "Mon, 14 Oct 2026 10:00:00 GMT"}
+
+
+def _node(model, tmp_path):
+    node = AINewsSummarizerNode(model, tavily_client=object(), store=DigestStore(str(tmp_path / "digests.sqlite")))
+    node.summary_cache = LRUCache("news_summaries", path=str(tmp_path / "news_summaries.sqlite"))
+    return node
+
+
+def _summarize(node, articles):
+    state = node.compress_articles({"news_data": articles})
+    return node.summarize_ai_news(state)
+
+
+def test_second_digest_only_sends_new_articles_in_full(tmp_path):
+    model = _DigestFakeChatModel(prompts=[])
+    node = _node(model, tmp_path)
+
+    _summarize(node, [_article("alpha"), _article("beta"), _article("gamma")])
+    _summarize(node, [_article("beta"), _article("gamma"), _article("delta")])
+
+    first, second = model.prompts
+    assert len(model.prompts) == 2
+    assert "Summary of beta story" in second and _article("beta")["content"] not in second
+    assert _article("delta")["content"] in second
+    assert estimate_tokens(second) < estimate_tokens(first)
+
+
+def test_default_configuration_map_reduces_long_articles(tmp_path):
+    model = _DigestFakeChatModel(prompts=[])
+    node = _node(model, tmp_path)
+
+    _summarize(node, [_article(f"story{i}", sentences=40) for i in range(node.max_results)])
+
+    article_prompts = [prompt for prompt in model.prompts if "news analyst" in prompt]
+    assert len(article_prompts) == node.max_results
+    assert len(model.prompts) == node.max_results + 1
@@ -0,0 +1,30 @@
+from itertools import cycle
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from src.workflow.graphs.chatbot_graph import Chatbot_graph
+from src.workflow.memory.checkpointer import thread_config
+
+
+def test_streamed_reply_excludes_the_fold_summary():
+    replies = cycle(["summary of the earlier turns " * 5, "the assistant reply to this question " * 5])
+    model = GenericFakeChatModel(messages=replies)
+    graph = Chatbot_graph(model, context_token_budget=120).build_graph(checkpointer=MemorySaver())
+    config = thread_config("fold-stream")
+
+    folded = False
+    for turn in range(4):
+        streamed = ""
+        message_ids = set()
+        question = f"question {turn} " + "with a long preamble " * 10
+        for chunk, metadata in graph.stream({"messages": [HumanMessage(content=question)]}, config=config, stream_mode="messages"):
+            if isinstance(chunk, AIMessage) and chunk.content:
+                streamed += chunk.content
+                message_ids.add(chunk.id)
+        state = graph.get_state(config).values
+        folded = folded or bool(state.get("context_summary"))
+
+        assert len(message_ids) == 1
+        assert streamed == state["messages"][-1].content
+    assert folded
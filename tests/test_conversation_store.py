@@ -0,0 +1,22 @@
+from src.workflow.store.conversation_store import ConversationStore
+
+
+def test_entries_survive_a_restart_without_eviction(tmp_path):
+    path = str(tmp_path / "conversations.sqlite")
+    store = ConversationStore(path, session_memory_cap=64)
+    history = store.history("session")
+    history.append({"role": "user", "content": "first question " * 10})
+    history.append({"role": "assistant", "content": "first answer " * 10})
+    history.append({"role": "user", "content": "latest question"})
+
+    reopened = ConversationStore(path)
+    assert [entry["content"] for entry in reopened.history("session")] == [entry["content"] for entry in history]
+
+
+def test_entries_dropped_from_memory_are_read_from_disk(tmp_path):
+    store = ConversationStore(str(tmp_path / "conversations.sqlite"), session_memory_cap=64)
+    history = store.history("session")
+    history.extend({"role": "user", "content": f"message {i} " * 10} for i in range(5))
+    assert store._sessions["session"].memory_start > 0
+    assert history[0]["content"] == "message 0 " * 10
+    assert len(history) == 5
@@ -0,0 +1,27 @@
+from src.workflow.utils.dedup import dedupe_articles, rank_articles
+
+
+def test_ties_are_ranked_newest_first_by_date_not_by_string():
+    articles = [
+        {"url": "https://example.com/older", "published_date": "Tue, 01 Oct 2026 10:00:00 GMT", "score": 0.5},
+        {"url": "https://example.com/newer", "published_date": "Mon, 14 Oct 2026 10:00:00 GMT", "score": 0.5},
+    ]
+    assert [news["url"] for news in rank_articles(articles)] == ["https://example.com/newer", "https://example.com/older"]
+
+
+def test_articles_without_content_are_only_deduplicated_by_url():
+    articles = [
+        {"url": "https://example.com/a", "title": "First story", "content": ""},
+        {"url": "https://example.com/b", "title": "Second story"},
+        {"url": "https://www.example.com/b/?utm_source=feed", "title": "Second story"},
+    ]
+    assert [news["url"] for news in dedupe_articles(articles)] == ["https://example.com/a", "https://example.com/b"]
+
+
+def test_near_duplicate_content_is_merged():
+    text = "OpenAI released a new model today with better reasoning and lower latency for developers " * 3
+    articles = [
+        {"url": "https://one.example.com/story", "title": "New model", "content": text, "score": 0.9},
+        {"url": "https://two.example.com/copy", "title": "New model", "content": text + " Read more.", "score": 0.4},
+    ]
+    assert [news["url"] for news in dedupe_articles(articles)] == ["https://one.example.com/story"]
@@ -0,0 +1,46 @@
+import time
+from itertools import cycle
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import HumanMessage
+from src.workflow.llms.hedged_model import HedgedChatModel
+from src.workflow.llms.resilient_model import ResilientChatModel
+
+
+class _SlowFakeChatModel(GenericFakeChatModel):
+    delay: float = 0.0
+
+    def _stream(self, *args, **kwargs):
+        time.sleep(self.delay)
+        yield from super()._stream(*args, **kwargs)
+
+    def _generate(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super()._generate(*args, **kwargs)
+
+
+def _hedged(primary_delay, secondary_delay):
+    primary = _SlowFakeChatModel(messages=cycle(["primary answer"]), delay=primary_delay)
+    secondary = _SlowFakeChatModel(messages=cycle(["secondary answer"]), delay=secondary_delay)
+    models = [ResilientChatModel.wrap(primary, "hedge-test-primary"), ResilientChatModel.wrap(secondary, "hedge-test-secondary")]
+    return HedgedChatModel(models=models, model_name="primary", min_hedge_delay=0.2, default_hedge_delay=0.2)
+
+
+def test_stream_hedges_a_slow_primary():
+    model = _hedged(primary_delay=3.0, secondary_delay=0.05)
+    start = time.perf_counter()
+    text = "".join(chunk.content for chunk in model.stream([HumanMessage(content="hi")]))
+    assert text == "secondary answer"
+    assert time.perf_counter() - start < 1.5
+
+
+def test_stream_keeps_a_fast_primary():
+    model = _hedged(primary_delay=0.0, secondary_delay=0.0)
+    assert "".join(chunk.content for chunk in model.stream([HumanMessage(content="hi")])) == "primary answer"
+
+
+def test_invoke_hedges_a_slow_primary():
+    model = _hedged(primary_delay=3.0, secondary_delay=0.05)
+    start = time.perf_counter()
+    assert model.invoke([HumanMessage(content="hi")]).content == "secondary answer"
+    assert time.perf_counter() - start < 1.5
@@ -0,0 +1,24 @@
+from itertools import cycle
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import HumanMessage
+from src.workflow.llms.resilient_model import ResilientChatModel
+from src.workflow.llms.routed_model import RoutedChatModel
+from src.workflow.metrics.callbacks import MetricsCallbackHandler
+
+
+def _tier(name):
+    model = ResilientChatModel.wrap(GenericFakeChatModel(messages=cycle(["an answer"])), "metrics-test")
+    return model.model_copy(update={"model_name": name})
+
+
+def _llm_names(handler):
+    return [event["name"] for event in handler.trace if event["event"] == "llm"]
+
+
+def test_routed_calls_are_reported_under_the_serving_model():
+    model = RoutedChatModel.wrap(_tier("gpt-4o-mini"), _tier("gpt-4o"))
+    handler = MetricsCallbackHandler()
+    model.invoke([HumanMessage(content="hi")], config={"callbacks": [handler]})
+    list(model.stream([HumanMessage(content="hi " * 30000)], config={"callbacks": [handler]}))
+    assert _llm_names(handler) == ["gpt-4o-mini", "gpt-4o"]
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from src.workflow.outbound.outbound_client import OUTBOUND_POLICIES, OutboundClient, get_outbound_client
+
+
+def _slow_stream(calls, words=("a", "b", "c")):
+    calls.append(1)
+    for word in words:
+        time.sleep(0.05)
+        yield word
+
+
+def test_identical_streams_share_one_call():
+    client = OutboundClient("stream-test", policy=OUTBOUND_POLICIES["default"])
+    calls = []
+    results = []
+
+    def consume():
+        results.append(list(client.stream(lambda: _slow_stream(calls), key="same")))
+
+    threads = [threading.Thread(target=consume) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [["a", "b", "c"]] * 3
+
+
+def test_stream_holds_its_slot_until_the_end():
+    client = OutboundClient("stream-test", policy=dict(OUTBOUND_POLICIES["default"], max_concurrency=1))
+    stream = client.stream(lambda: _slow_stream([]))
+    assert next(stream) == "a"
+    assert not client.slots.acquire(blocking=False)
+    assert list(stream) == ["b", "c"]
+    assert client.slots.acquire(blocking=False)
+
+
+def test_each_api_key_gets_its_own_rate_limit():
+    assert get_outbound_client("groq", "key-a") is get_outbound_client("groq", "key-a")
+    assert get_outbound_client("groq", "key-a").bucket is not get_outbound_client("groq", "key-b").bucket
+
+
+def test_global_ceiling_caps_calls_across_accounts():
+    ceiling = threading.BoundedSemaphore(1)
+    first = OutboundClient("ceiling-test", policy=OUTBOUND_POLICIES["default"], ceiling=ceiling)
+    second = OutboundClient("ceiling-test", policy=OUTBOUND_POLICIES["default"], ceiling=ceiling)
+    stream = first.stream(lambda: _slow_stream([]))
+    assert next(stream) == "a"
+    with pytest.raises(TimeoutError):
+        second.call(lambda: "late", deadline=0.2)
+    assert list(stream) == ["b", "c"]
+    assert second.call(lambda: "done") == "done"
@@ -0,0 +1,17 @@
+from src.workflow.llms.providers import failover_api_keys
+
+FAILOVER_MODELS = {"Groq": "llama-3.1-8b-instant", "OpenAI": "OpenAI-GPT-4o-mini", "Gemini": "Gemini-2.5-flash"}
+
+
+def test_failover_keys_ignore_keys_other_sessions_wrote_to_the_environment(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "another-sessions-key")
+    monkeypatch.delenv("FAILOVER_OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("FAILOVER_GOOGLE_API_KEY", "server-key")
+    user_selections = {"llm_model": "Groq", "llm_api_key": "groq-key", "failover_api_keys": {"OpenAI": ""}}
+    assert failover_api_keys(user_selections, FAILOVER_MODELS) == {"Gemini": "server-key"}
+
+
+def test_session_failover_keys_take_precedence(monkeypatch):
+    monkeypatch.setenv("FAILOVER_OPENAI_API_KEY", "server-key")
+    user_selections = {"llm_model": "Groq", "failover_api_keys": {"OpenAI": "session-key"}}
+    assert failover_api_keys(user_selections, FAILOVER_MODELS)["OpenAI"] == "session-key"
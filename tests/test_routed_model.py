@@ -0,0 +1,18 @@
+from itertools import cycle
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from src.workflow.llms import providers
+
+
+class _NamedFakeChatModel(GenericFakeChatModel):
+    model_name: str = ""
+
+
+def test_routing_uses_the_selected_model_as_the_large_tier(monkeypatch):
+    monkeypatch.setattr(
+        providers, "build_chat_model",
+        lambda selections: _NamedFakeChatModel(messages=cycle(["answer"]), model_name=selections["groq_model"]),
+    )
+    user_selections = {"llm_model": "Groq", "groq_model": "openai/gpt-oss-120b"}
+    model = providers.build_routed_chat_model(user_selections, {"Groq": "llama-3.1-8b-instant"})
+    assert model.model_name == "llama-3.1-8b-instant|openai/gpt-oss-120b"
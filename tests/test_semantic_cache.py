@@ -0,0 +1,42 @@
+import pytest
+
+from src.workflow.cache import semantic_cache
+from src.workflow.cache.semantic_cache import SemanticCache
+
+DIFFERENT_QUESTIONS = [
+    ("How do I sort a list in ascending order?", "How do I sort a list in descending order?"),
+    ("What was the population of India in 2020?", "What was the population of India in 2024?"),
+    ("What happened to the Roman Empire in the 3rd century?", "What happened to the Roman Empire in the 5th century?"),
+    ("What are the advantages of TCP over UDP?", "What are the advantages of UDP over TCP?"),
+    ("Is Python a compiled language?", "Is Python not a compiled language?"),
+]
+
+SAME_QUESTIONS = [
+    ("what is RAG", "explain RAG"),
+    ("What is retrieval augmented generation?", "Explain retrieval augmented generation"),
+    ("How to sort a list in Python", "how do I sort lists in python?"),
+]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(semantic_cache, "data_path", lambda *parts: str(tmp_path.joinpath(*parts)))
+    (tmp_path / "cache").mkdir()
+    return SemanticCache(name="test")
+
+
+@pytest.mark.parametrize("cached, asked", DIFFERENT_QUESTIONS)
+def test_different_questions_miss(cache, cached, asked):
+    cache.add(cached, "cached answer", "context")
+    assert cache.lookup(asked, "context") is None
+
+
+@pytest.mark.parametrize("cached, asked", SAME_QUESTIONS)
+def test_paraphrases_hit(cache, cached, asked):
+    cache.add(cached, "cached answer", "context")
+    assert cache.lookup(asked, "context") == "cached answer"
+
+
+def test_other_context_misses(cache):
+    cache.add("what is RAG", "cached answer", "context")
+    assert cache.lookup("what is RAG", "other context") is None